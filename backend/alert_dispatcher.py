@@ -0,0 +1,266 @@
+import os
+import queue
+import smtplib
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+import requests
+
+from database import close_connection, log_alert_delivery
+from metrics import metrics
+
+ALERTS = metrics.counter('fall_alerts_total', 'Alert deliveries by channel and outcome')
+ALERT_SEND_MS = metrics.histogram('fall_alert_send_ms', 'Time for the provider to accept one alert')
+ALERT_HANDOFF_MS = metrics.histogram('fall_alert_handoff_ms', 'Time from fall detection to provider hand-off, retries included')
+
+# Endpoints can be pointed at a local fake server for testing
+SEMAPHORE_API_URL = os.getenv('SEMAPHORE_API_URL', 'https://api.semaphore.co/api/v4/messages')
+SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.getenv('SMTP_PORT', '465'))
+SMTP_SSL = os.getenv('SMTP_SSL', 'true').lower() == 'true'
+
+ALERT_MESSAGE = "A fall has been detected, please respond immediately."
+
+
+class Alert:
+    def __init__(self, channel, recipient, detected_at, camera_id=None):
+        self.channel = channel
+        self.recipient = recipient
+        self.detected_at = detected_at
+        self.camera_id = camera_id
+
+
+class SmsSender:
+    """Sends SMS through Semaphore on a pooled HTTP session"""
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def is_configured(self, recipient):
+        if not os.getenv('SEMAPHORE_API_KEY'):
+            print("Semaphore API key not configured in .env")
+            return False
+        if not recipient:
+            print("No recipient phone number configured in settings")
+            return False
+        return True
+
+    def send(self, alert):
+        payload = {
+            "apikey": os.getenv('SEMAPHORE_API_KEY'),
+            "number": alert.recipient,
+            "message": ALERT_MESSAGE,
+            "sendername": "CAIRE"
+        }
+        response = self.session.post(SEMAPHORE_API_URL, data=payload, timeout=self.timeout)
+        response.raise_for_status()
+        print(f"SMS sent! Response: {response.text}")
+
+    def close(self):
+        self.session.close()
+
+
+class EmailSender:
+    """Sends email over one SMTP connection that is kept open between alerts"""
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self.server = None
+
+    def is_configured(self, recipient):
+        if not os.getenv('EMAIL_SENDER'):
+            print("Email credentials not configured in .env")
+            return False
+        if not recipient:
+            print("No recipient email configured in settings")
+            return False
+        return True
+
+    def connect(self):
+        if SMTP_SSL:
+            server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=self.timeout)
+
+        app_password = os.getenv('EMAIL_APP_PASSWORD')
+        if app_password:
+            server.login(os.getenv('EMAIL_SENDER'), app_password)
+        return server
+
+    def get_server(self):
+        """Reuse the open connection if the server still answers, otherwise reconnect"""
+        if self.server is not None:
+            try:
+                if self.server.noop()[0] == 250:
+                    return self.server
+            except OSError:
+                pass
+            self.close()
+        self.server = self.connect()
+        return self.server
+
+    def send(self, alert):
+        sender_email = os.getenv('EMAIL_SENDER')
+        timestamp = datetime.fromtimestamp(alert.detected_at).strftime("%B %d, %Y at %I:%M:%S %p")
+
+        msg = MIMEMultipart()
+        msg['From'] = sender_email
+        msg['To'] = alert.recipient
+        msg['Subject'] = "CAIRE Alert: Fall Detected"
+
+        body = f"""{ALERT_MESSAGE}
+
+Detection Time: {timestamp}
+
+This is an automated alert from the CAIRE Fall Detection System."""
+
+        msg.attach(MIMEText(body, 'plain'))
+
+        try:
+            self.get_server().sendmail(sender_email, alert.recipient, msg.as_string())
+        except Exception:
+            # Drop the connection so the retry starts from a fresh one
+            self.close()
+            raise
+
+        print(f"Email alert sent successfully to {alert.recipient}")
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self.server = None
+
+
+class AlertDispatcher:
+    """Delivers fall alerts from background workers so detection never waits on SMS or SMTP.
+
+    Each channel has its own queue and worker thread, so a slow mail server
+    doesn't hold up SMS. Failed sends are retried with exponential backoff
+    and every delivery is recorded in the alert_deliveries table together
+    with the time from detection to hand-off to the provider.
+    """
+
+    def __init__(self, max_attempts=3, backoff_seconds=1.0):
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.senders = {'sms': SmsSender(), 'email': EmailSender()}
+        self.queues = {channel: queue.Queue() for channel in self.senders}
+        self.workers = {}
+        self.lock = threading.Lock()
+
+        self.stats = {channel: {"queued": 0, "sent": 0, "failed": 0, "retries": 0} for channel in self.senders}
+        self.handoff_ms = {channel: deque(maxlen=100) for channel in self.senders}
+
+    def start(self):
+        with self.lock:
+            for channel in self.senders:
+                worker = self.workers.get(channel)
+                if worker and worker.is_alive():
+                    continue
+                worker = threading.Thread(target=self._worker_loop, args=(channel,),
+                                          name=f"alert-{channel}", daemon=True)
+                worker.start()
+                self.workers[channel] = worker
+
+    def send_alert(self, channel, recipient, detected_at=None, camera_id=None):
+        """Queue an alert and return immediately, False if the channel isn't configured"""
+        if not self.senders[channel].is_configured(recipient):
+            return False
+
+        self.start()
+        alert = Alert(channel, recipient, detected_at or time.time(), camera_id)
+        self.queues[channel].put(alert)
+        with self.lock:
+            self.stats[channel]["queued"] += 1
+        return True
+
+    def _worker_loop(self, channel):
+        alerts = self.queues[channel]
+        while True:
+            alert = alerts.get()
+            if alert is None:
+                break
+            try:
+                self._deliver(alert)
+            finally:
+                alerts.task_done()
+        # Deliveries are logged on this thread's database connection
+        close_connection()
+
+    def _deliver(self, alert):
+        sender = self.senders[alert.channel]
+        error = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                started = time.perf_counter()
+                sender.send(alert)
+                ALERT_SEND_MS.observe((time.perf_counter() - started) * 1000, channel=alert.channel)
+                handoff_ms = (time.time() - alert.detected_at) * 1000
+                ALERT_HANDOFF_MS.observe(handoff_ms, channel=alert.channel)
+                ALERTS.inc(channel=alert.channel, status="sent")
+                with self.lock:
+                    self.stats[alert.channel]["sent"] += 1
+                    self.handoff_ms[alert.channel].append(handoff_ms)
+                self._log(alert, "sent", attempt, handoff_ms=handoff_ms)
+                return True
+            except Exception as e:
+                error = str(e)
+                print(f"Failed to send {alert.channel} alert (attempt {attempt}/{self.max_attempts}): {e}")
+                if attempt < self.max_attempts:
+                    with self.lock:
+                        self.stats[alert.channel]["retries"] += 1
+                    time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+
+        ALERTS.inc(channel=alert.channel, status="failed")
+        with self.lock:
+            self.stats[alert.channel]["failed"] += 1
+        self._log(alert, "failed", self.max_attempts, error=error)
+        return False
+
+    def _log(self, alert, status, attempts, error=None, handoff_ms=None):
+        try:
+            log_alert_delivery(alert.channel, alert.recipient, status, attempts, alert.detected_at,
+                               camera_source=None if alert.camera_id is None else str(alert.camera_id),
+                               error=error, handoff_ms=handoff_ms)
+        except Exception as e:
+            print(f"Failed to log alert delivery: {e}")
+
+    def get_stats(self):
+        with self.lock:
+            stats = {}
+            for channel, counts in self.stats.items():
+                latencies = sorted(self.handoff_ms[channel])
+                stats[channel] = {
+                    **counts,
+                    "pending": self.queues[channel].qsize(),
+                    "handoff_ms_avg": sum(latencies) / len(latencies) if latencies else None,
+                    "handoff_ms_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+                    "handoff_ms_last": self.handoff_ms[channel][-1] if latencies else None,
+                }
+            return stats
+
+    def stop(self, timeout=5):
+        """Let queued alerts finish, then stop the workers and close connections"""
+        with self.lock:
+            workers = dict(self.workers)
+            self.workers.clear()
+        for channel, worker in workers.items():
+            self.queues[channel].put(None)
+            worker.join(timeout=timeout)
+        for sender in self.senders.values():
+            sender.close()
+
+
+alert_dispatcher = AlertDispatcher()
+
+metrics.callback('fall_alert_queue_depth', 'Alerts waiting to be sent',
+                 lambda: [({'channel': channel}, alerts.qsize()) for channel, alerts in alert_dispatcher.queues.items()])
@@ -1,24 +1,88 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+import time
+
+# Startup phases are timed from the first import
+_startup_began = time.perf_counter()
+
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, WebSocket, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, Response
-from ultralytics import YOLO
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pathlib import Path
+from contextlib import asynccontextmanager, contextmanager
 from dotenv import load_dotenv
-import cv2
-import shutil
+import hashlib
 import uuid
-from datetime import datetime
+import base64
+import json
+from datetime import datetime, timedelta
 import os
 
 # Load .env file
 load_dotenv()
 
-from live_detection import LiveDetector
-from database import save_detection, get_all_detections, get_detection_stats, delete_all_detections, create_user, verify_user, get_all_users, delete_user, get_all_settings, get_settings_by_category, update_setting, change_password, get_falls_per_day, get_falls_by_hour, get_falls_in_range, get_today_falls, get_week_falls, get_last_fall, get_confidence_distribution, get_recent_detections, delete_detection
+from alert_dispatcher import alert_dispatcher
+from camera_manager import CameraManager
+from video_detection import detect_video as run_video_detection
+from video_jobs import VideoJob, VideoJobQueue
+from video_pipeline import SAMPLING_MODES
+from inference_cache import InferenceCache
+from model_registry import model_registry
+from metrics import metrics
+from database import init_schema, close_connection, save_detection, get_all_detections, get_detection_stats, delete_all_detections, create_user, verify_user, get_all_users, delete_user, get_all_settings, get_settings_by_category, update_setting, change_password, get_falls_per_day, get_falls_per_day_in_range, get_falls_by_hour, get_falls_in_range, get_today_falls, get_week_falls, get_last_fall, get_confidence_distribution, get_recent_detections, get_dashboard_data, get_detections_version, get_alert_deliveries, delete_detection, get_all_cameras, get_camera, create_camera, create_default_camera, update_camera, delete_camera
 from report_generator import generate_report
+from settings_cache import settings_cache
+
+# ==================== STARTUP ====================
+# Importing this module stays cheap: no models, no torch and no database
+# access. The lifespan hook below sets up the schema, loads and warms up the
+# models and configures the background services, timing each phase.
+
+startup_phases = [("imports", (time.perf_counter() - _startup_began) * 1000)]
+
+@contextmanager
+def startup_phase(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_phases.append((name, (time.perf_counter() - started) * 1000))
+
+def print_startup_report():
+    print("⏱️ Startup report")
+    for name, ms in startup_phases:
+        print(f"   {name:<24}{ms:>9.0f} ms")
+    print(f"   {'total':<24}{sum(ms for _, ms in startup_phases):>9.0f} ms")
+
+@asynccontextmanager
+async def lifespan(app):
+    with startup_phase("database schema"):
+        init_schema()
+    with startup_phase("settings"):
+        settings_cache.load()
+
+    # Each weights file is loaded and warmed up once, then shared by cameras and video jobs
+    model_registry.backend = settings_cache.get('inference_backend', 'pytorch')
+    for name, path in (('fall', MODEL_PATH), ('pose', POSE_MODEL_PATH)):
+        model_registry.load(name, path)
+        entry = model_registry.get_stats()[name]
+        startup_phases.append((f"{name} model load", entry['load_ms']))
+        if entry['warmup_ms'] is not None:
+            startup_phases.append((f"{name} model warm-up", entry['warmup_ms']))
+
+    with startup_phase("services"):
+        camera_manager.swap_models(model_registry.get('fall'), model_registry.get('pose'))
+        inference_cache.model_version = model_registry.version('fall')
+        inference_cache.max_bytes = settings_cache.get_int('inference_cache_max_mb', 500) * 1024 * 1024
+        video_jobs.configure(settings_cache.get_int('video_max_concurrent_jobs', 1))
+
+    print_startup_report()
+    yield
+    camera_manager.stop_all()
+    # Cameras are stopped first so no new alerts get queued while the last ones are sent
+    alert_dispatcher.stop()
 
 # Initialize FastAPI app
-app = FastAPI(title="Fall Detection API", version="1.0")
+app = FastAPI(title="Fall Detection API", version="1.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -32,12 +96,8 @@ app.add_middleware(
 # Load model paths from .env
 MODEL_PATH = os.getenv("MODEL_PATH")
 POSE_MODEL_PATH = os.getenv("POSE_MODEL_PATH")
-
-model = YOLO(MODEL_PATH)
-pose_model = YOLO(POSE_MODEL_PATH)
-
-print(f"Model loaded from: {MODEL_PATH}")
-print(f"Pose model loaded from: {POSE_MODEL_PATH}")
+# Weights that /models/{name}/swap may load, besides the configured ones
+MODELS_DIR = Path(os.getenv("MODELS_DIR", Path(__file__).parent / "models"))
 
 # Directories
 UPLOAD_DIR = Path(__file__).parent / "uploads"
@@ -45,22 +105,81 @@ OUTPUT_DIR = Path(__file__).parent / "outputs"
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-# Live detection setup
-from database import get_setting
-
-def get_camera_source():
-    """Get camera source — returns int (webcam index) or str (RTSP URL)"""
-    camera_source = get_setting('camera_source', os.getenv('CAMERA_SOURCE', 'rtsp'))
-    if camera_source == 'webcam':
-        camera_index = int(get_setting('camera_index', os.getenv('CAMERA_INDEX', '0')))
-        return camera_index
-    return get_setting('camera_url', os.getenv('CAMERA_URL', ''))
-
 def get_confidence():
     """Get confidence threshold from settings"""
-    return float(get_setting('confidence_threshold', '0.75'))
+    return settings_cache.get_float('confidence_threshold', 0.75)
+
+# Models and settings are filled in by the lifespan hook
+camera_manager = CameraManager()
+
+# Uploaded videos are analysed in the background, a few at a time
+# Detections of uploaded videos are cached by content hash and model version
+inference_cache = InferenceCache(Path(__file__).parent / "cache" / "inference", None)
+
+def process_video_job(job):
+    return run_video_detection(model_registry.get('fall'), job, OUTPUT_DIR, job.params.get('confidence', get_confidence()),
+                               cache=inference_cache)
+
+video_jobs = VideoJobQueue(process_video_job)
+
+def on_video_setting_changed(key, value):
+    if key == 'video_max_concurrent_jobs':
+        video_jobs.configure(settings_cache.get_int('video_max_concurrent_jobs', 1))
+    elif key == 'inference_cache_max_mb':
+        inference_cache.max_bytes = settings_cache.get_int('inference_cache_max_mb', 500) * 1024 * 1024
+        inference_cache.evict()
+
+settings_cache.subscribe(on_video_setting_changed)
 
-live_detector = None
+def on_model_swapped(name, model):
+    """Running cameras switch right away, video jobs pick the new model up when they start"""
+    if name == 'fall':
+        inference_cache.model_version = model_registry.version('fall')
+        camera_manager.swap_models(model=model)
+    elif name == 'pose':
+        camera_manager.swap_models(pose_model=model)
+
+model_registry.subscribe(on_model_swapped)
+
+def on_backend_change_failed(backend, error):
+    """Put the setting back to the backend that is still serving"""
+    update_setting('inference_backend', model_registry.backend)
+    # Runs on the switch's own thread, which ends after this
+    close_connection()
+
+def on_backend_setting_changed(key, value):
+    # Exporting can take minutes, so the switch runs off the request thread
+    if key == 'inference_backend':
+        model_registry.change_backend(value, on_failure=on_backend_change_failed)
+
+settings_cache.subscribe(on_backend_setting_changed)
+
+# ==================== METRICS ====================
+
+# Latency histograms are recorded where the work happens (camera_stream,
+# live_detection, inference_scheduler, database, alert_dispatcher, video_jobs).
+# These gauges read the running objects when /metrics is scraped.
+
+def camera_stat(key):
+    def collect():
+        return [({"camera": str(camera_id)}, detector.get_stats().get(key))
+                for camera_id, detector in list(camera_manager.detectors.items())]
+    return collect
+
+metrics.callback("fall_camera_processing_fps", "Smoothed frames per second processed per camera",
+                 camera_stat("processing_fps"))
+metrics.callback("fall_camera_frames_captured_total", "Frames read from each camera",
+                 camera_stat("frames_captured"), kind="counter")
+metrics.callback("fall_camera_frames_dropped_total", "Frames dropped because detection fell behind",
+                 camera_stat("frames_dropped"), kind="counter")
+metrics.callback("fall_camera_reconnects_total", "Camera reconnects after a lost stream",
+                 camera_stat("reconnects"), kind="counter")
+metrics.callback("fall_cameras_running", "Cameras with live detection running",
+                 lambda: [({}, len(camera_manager.running_camera_ids()))])
+metrics.callback("fall_inference_queue_depth", "Frames waiting for the batch inference scheduler",
+                 lambda: [({}, len(camera_manager.scheduler.pending))] if camera_manager.scheduler else [])
+metrics.callback("fall_video_jobs", "Uploaded video jobs by state",
+                 lambda: [({"state": state}, video_jobs.get_stats()[state]) for state in ("active", "queued")])
 
 # Root endpoint
 @app.get("/")
@@ -71,11 +190,23 @@ def read_root():
         "endpoints": {
             "health": "/health",
             "detect_video": "/detect/video",
+            "jobs": "/jobs/{job_id}",
             "model_info": "/model/info",
+            "models": "/models",
+            "models_backend": "/models/backend",
+            "startup": "/startup",
+            "metrics": "/metrics",
+            "metrics_summary": "/metrics/summary",
             "live_start": "/live/start",
             "live_stop": "/live/stop",
             "live_frame": "/live/frame",
+            "live_status": "/live/status",
+            "live_stream": "/live/stream.mjpg",
+            "live_events": "/live/events",
+            "live_websocket": "/live/ws",
             "stream_url": "/live/stream-url",
+            "camera_live": "/live/{camera_id}/start|stop|frame|status|stream.mjpg|events|ws",
+            "cameras": "/cameras",
             "logs_list": "/logs/list",
             "logs_stats": "/logs/stats",
             "logs_delete_all": "/logs/delete-all",
@@ -83,17 +214,36 @@ def read_root():
             "auth_register": "/auth/register",
             "auth_users": "/auth/users",
             "settings": "/settings",
-            "settings_update": "/settings/update"
+            "settings_update": "/settings/update",
+            "settings_version": "/settings/version"
         }
     }
 
+# Time spent in each startup phase
+@app.get("/startup")
+def startup_report():
+    return {
+        "phases": [{"phase": name, "ms": round(ms, 1)} for name, ms in startup_phases],
+        "total_ms": round(sum(ms for _, ms in startup_phases), 1)
+    }
+
+# Prometheus scrape endpoint
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(content=metrics.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Same metrics as JSON with p50/p95/p99 per histogram, for the dashboard
+@app.get("/metrics/summary")
+def metrics_summary():
+    return metrics.summary()
+
 # Health check
 @app.get("/health")
 def health_check():
     return {
         "status": "healthy",
-        "model_loaded": True,
-        "pose_model_loaded": True,
+        "model_loaded": 'fall' in model_registry.entries,
+        "pose_model_loaded": 'pose' in model_registry.entries,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -101,90 +251,123 @@ def health_check():
 @app.get("/model/info")
 def model_info():
     return {
-        "model_path": MODEL_PATH,
-        "pose_model_path": POSE_MODEL_PATH,
+        "model_path": model_registry.path('fall'),
+        "pose_model_path": model_registry.path('pose'),
         "model_type": "YOLOv8",
-        "classes": model.names,
+        "backend": model_registry.get_stats()['fall']['backend'],
+        "classes": model_registry.get('fall').names,
         "input_size": 640
     }
 
+# Loaded models with load and warm-up times
+@app.get("/models")
+def list_models():
+    return model_registry.get_stats()
+
+# Serving backend and the outcome of the last switch requested through the settings
+@app.get("/models/backend")
+def get_model_backend():
+    return model_registry.get_backend_status()
+
+def resolve_weights_path(path):
+    """The weights file a swap may load: inside MODELS_DIR or one of the configured model paths.
+
+    Loading .pt weights unpickles them, so arbitrary server paths are refused.
+    Relative paths are taken from MODELS_DIR.
+    """
+    models_dir = MODELS_DIR.resolve()
+    resolved = (models_dir / path).resolve()
+    configured = {Path(p).resolve() for p in (MODEL_PATH, POSE_MODEL_PATH) if p}
+    if not resolved.is_relative_to(models_dir) and resolved not in configured:
+        raise HTTPException(status_code=403, detail=f"Weights must be in {MODELS_DIR}: {path}")
+    if not resolved.exists():
+        raise HTTPException(status_code=400, detail=f"Weights file not found: {path}")
+    return resolved
+
+@app.post("/models/{name}/swap")
+def swap_model(name: str, path: str):
+    """Load a new weights file for 'fall' or 'pose' and switch to it without a restart"""
+    if name not in model_registry.entries:
+        raise HTTPException(status_code=404, detail=f"Model '{name}' not found")
+    path = resolve_weights_path(path)
+    try:
+        model_registry.swap(name, path)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to load model: {str(e)}")
+    return {
+        "success": True,
+        "message": f"Model '{name}' swapped",
+        "model": model_registry.get_stats()[name]
+    }
+
 # Video detection endpoint
+def save_upload(file, path, chunk_size=1024 * 1024):
+    """Write an upload to disk, returns the sha256 of its contents computed on the way"""
+    digest = hashlib.sha256()
+    with open(path, "wb") as buffer:
+        for chunk in iter(lambda: file.file.read(chunk_size), b""):
+            digest.update(chunk)
+            buffer.write(chunk)
+    return digest.hexdigest()
+
 @app.post("/detect/video")
-async def detect_video(file: UploadFile = File(...)):
+async def detect_video(file: UploadFile = File(...), parallel: bool = Form(False), sampling: str = Form('all'),
+                       stride: int = Form(5), target_fps: float = Form(5)):
+    """Store the upload and queue it for analysis, poll /jobs/{job_id} for progress and results.
+
+    parallel=true splits long videos into segments that are processed on all cores.
+    sampling picks which frames are analysed: all, stride (every Nth frame),
+    fps (target analysis fps) or dense (sparse pass, then full rate around candidate falls).
+    """
+    if not file.filename.endswith(('.mp4', '.avi', '.mov', '.mkv')):
+        raise HTTPException(status_code=400, detail="Invalid file format. Use mp4, avi, mov, or mkv")
+    if sampling not in SAMPLING_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid sampling mode. Use one of: {', '.join(SAMPLING_MODES)}")
+
     try:
-        if not file.filename.endswith(('.mp4', '.avi', '.mov', '.mkv')):
-            raise HTTPException(status_code=400, detail="Invalid file format. Use mp4, avi, mov, or mkv")
-        
         file_id = str(uuid.uuid4())[:8]
         input_filename = f"{file_id}_{file.filename}"
         input_path = UPLOAD_DIR / input_filename
-        
-        with open(input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        print(f"Processing: {input_filename}")
-        
-        confidence = get_confidence()
-        results = model(
-            source=str(input_path),
-            conf=confidence,
-            save=True,
-            project=str(OUTPUT_DIR),
-            name=file_id,
-            exist_ok=True
-        )
-        
-        total_detections = 0
-        detections_by_frame = []
-        
-        for i, r in enumerate(results):
-            frame_detections = len(r.boxes)
-            total_detections += frame_detections
-            
-            if frame_detections > 0:
-                for box in r.boxes:
-                    detection_class = model.names[int(box.cls[0])]
-                    confidence = float(box.conf[0])
-                    
-                    detections_by_frame.append({
-                        "frame": i,
-                        "confidence": confidence,
-                        "class": detection_class,
-                        "bbox": box.xyxy[0].tolist()
-                    })
-                    
-                    if 'fall' in detection_class.lower():
-                        save_detection(
-                            detection_type='fall',
-                            confidence=confidence,
-                            camera_source='upload',
-                            notes=f"Video: {file.filename}, Frame: {i}"
-                        )
-                        print(f"Fall saved to database from video! Frame {i}, Confidence: {confidence:.2f}")
-        
-        output_dir = OUTPUT_DIR / file_id
-        saved_files = list(output_dir.glob(f"{file_id}_*"))
-        actual_filename = saved_files[0].name if saved_files else input_filename
-        
-        print(f"Saved as: {actual_filename}")
-        
-        response = {
+
+        content_hash = await run_in_threadpool(save_upload, file, input_path)
+
+        job = video_jobs.submit(VideoJob(file_id, file.filename, input_path, {
+            "confidence": get_confidence(),
+            "parallel": parallel,
+            "sampling": sampling,
+            "stride": stride,
+            "target_fps": target_fps,
+            "workers": settings_cache.get_int('video_segment_workers', 0),
+            "model_path": model_registry.artifact('fall'),
+            "content_hash": content_hash,
+        }))
+        print(f"Queued: {input_filename}")
+
+        return JSONResponse(status_code=202, content={
             "success": True,
-            "file_id": file_id,
-            "filename": actual_filename,
-            "total_frames": len(results),
-            "total_detections": total_detections,
-            "detections": detections_by_frame[:10],
-            "output_video": str(OUTPUT_DIR / file_id / actual_filename),
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        print(f"Processed: {total_detections} detections found")
-        return JSONResponse(content=response)
-    
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/jobs/{job.id}"
+        })
+
     except Exception as e:
         print(f"Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+
+@app.get("/inference/cache")
+def get_inference_cache_status():
+    return inference_cache.get_stats()
+
+@app.get("/jobs")
+def list_video_jobs():
+    return {"data": video_jobs.list_jobs(), **video_jobs.get_stats()}
+
+@app.get("/jobs/{job_id}")
+def get_video_job(job_id: str):
+    job = video_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
 
 # Download processed video
 @app.get("/download/{file_id}/{filename}")
@@ -200,6 +383,8 @@ def download_video(file_id: str, filename: str):
         media_type = "video/quicktime"
     elif filename.endswith('.mkv'):
         media_type = "video/x-matroska"
+    elif filename.endswith('.csv.gz'):
+        media_type = "application/gzip"
     else:
         media_type = "video/mp4"
     
@@ -210,77 +395,260 @@ def download_video(file_id: str, filename: str):
     )
 
 # ==================== LIVE DETECTION ENDPOINTS ====================
+# The /live/... routes drive the default camera, the first row of the cameras
+# table; /live/{camera_id}/... routes drive any camera. The camera_source,
+# camera_url and camera_index settings describe the default camera and are
+# kept in step with its row in both directions.
 
-@app.get("/live/start")
-def start_live_detection():
-    global live_detector
-    
-    if live_detector and live_detector.is_running:
-        return {"status": "already_running"}
+def get_default_camera():
+    cameras = get_all_cameras()
+    return cameras[0] if cameras else None
+
+def get_default_camera_id():
+    camera = get_default_camera()
+    return camera['id'] if camera else None
+
+def get_default_camera_or_404():
+    camera = get_default_camera()
+    if camera is None:
+        raise HTTPException(status_code=404, detail="No camera registered")
+    return camera
+
+def on_camera_setting_changed(key, value):
+    """Copy an edited camera setting onto the default camera's row"""
+    if key not in ('camera_source', 'camera_url', 'camera_index'):
+        return
+    camera = get_default_camera()
+    if camera is None:
+        create_default_camera()
+        return
+    if key == 'camera_source':
+        if value == 'webcam':
+            source_type = 'webcam'
+        else:
+            # 'rtsp' in settings covers both streams and video files
+            source_type = camera['source_type'] if camera['source_type'] != 'webcam' else 'rtsp'
+        fields = {'source_type': source_type}
+    elif key == 'camera_url':
+        fields = {'url': value}
+    else:
+        fields = {'camera_index': int(value or 0)}
+    if any(camera[field] != new for field, new in fields.items()):
+        update_camera(camera['id'], **fields)
+
+settings_cache.subscribe(on_camera_setting_changed)
+
+def sync_camera_settings():
+    """Copy the default camera's row into the camera settings after it is edited or replaced"""
+    camera = get_default_camera()
+    if camera is None:
+        return
+    values = {
+        'camera_source': 'webcam' if camera['source_type'] == 'webcam' else 'rtsp',
+        'camera_url': camera['url'] or '',
+        'camera_index': str(camera['camera_index']),
+    }
+    for key, value in values.items():
+        if settings_cache.get(key) != value:
+            update_setting(key, value)
+
+def get_camera_source_for(camera):
+    """Camera source for a registered camera — int (webcam index) or str (RTSP URL or video file path)"""
+    if camera['source_type'] == 'webcam':
+        return int(camera['camera_index'])
+    return camera['url']
+
+def start_camera(camera_id, camera_source):
+    detector, status = camera_manager.start(camera_id, camera_source)
     
-    camera_source = get_camera_source()
-    print(f"DEBUG - camera_source value: {camera_source}")
-    print(f"DEBUG - type: {type(camera_source)}")
-    live_detector = LiveDetector(MODEL_PATH, camera_source, pose_model)
+    if status == "already_running":
+        return {"status": "already_running", "camera_id": camera_id}
     
-    if live_detector.connect_camera():
-        source_label = f"Webcam (index {camera_source})" if isinstance(camera_source, int) else "RTSP stream"
+    if status == "success":
+        if isinstance(camera_source, int):
+            source_label = f"Webcam (index {camera_source})"
+        elif detector.stream.is_file:
+            source_label = f"Video file {Path(camera_source).name}"
+        else:
+            source_label = "RTSP stream"
         return {
             "status": "success",
+            "camera_id": camera_id,
             "message": f"Live detection started — {source_label}"
         }
     else:
         return {
             "status": "error",
+            "camera_id": camera_id,
             "message": "Failed to connect to camera"
         }
 
-@app.get("/live/stop")
-def stop_live_detection():
-    global live_detector
-    
-    if live_detector:
-        live_detector.stop()
-        live_detector = None
-        return {"status": "stopped"}
-    
-    return {"status": "not_running"}
+def stop_camera(camera_id):
+    if camera_manager.stop(camera_id):
+        return {"status": "stopped", "camera_id": camera_id}
+    return {"status": "not_running", "camera_id": camera_id}
 
-@app.get("/live/frame")
-def get_live_frame():
-    global live_detector
-    
-    if not live_detector or not live_detector.is_running:
+def get_running_detector(camera_id):
+    detector = camera_manager.get(camera_id)
+    if detector is None:
         raise HTTPException(status_code=400, detail="Live detection not running")
+    return detector
+
+def latest_frame_response(detector):
+    result = detector.get_latest_result()
     
-    frame_b64, detections, saved_image = live_detector.detect_frame()
-    
-    if frame_b64 is None:
-        raise HTTPException(status_code=500, detail="Failed to read frame")
-    
-    if saved_image:
-        for detection in detections:
-            if 'fall' in detection['class'].lower():
-                print(f"Saving fall with image: {saved_image}")
-                save_detection(
-                    detection_type='fall',
-                    confidence=detection['confidence'],
-                    camera_source='live',
-                    image_data=saved_image,
-                    notes=f"Bounding box: {detection['bbox']}"
-                )
-                print(f"Fall saved to database with image!")
-                break
+    if result is None:
+        raise HTTPException(status_code=503, detail="No frame available yet")
     
     return {
-        "frame": frame_b64,
-        "detections": detections,
-        "timestamp": datetime.now().isoformat()
+        "frame": base64.b64encode(result['jpeg']).decode('utf-8'),
+        "detections": result['detections'],
+        "frame_id": result['frame_id'],
+        "camera_id": detector.camera_id,
+        "timestamp": result['timestamp']
     }
+
+# The streaming generators are async so every open stream waits on the event
+# loop; a blocking wait would hold one threadpool worker per viewer
+
+async def mjpeg_frames(detector):
+    last_frame_id = 0
+    while detector.is_running:
+        result = await detector.wait_for_result_async(last_frame_id)
+        if result is None:
+            continue
+        last_frame_id = result['frame_id']
+        jpeg = result['jpeg']
+        yield (
+            b"--frame\r\n"
+            b"Content-Type: image/jpeg\r\n"
+            b"Content-Length: " + str(len(jpeg)).encode() + b"\r\n\r\n"
+            + jpeg + b"\r\n"
+        )
+
+def mjpeg_response(detector):
+    return StreamingResponse(
+        mjpeg_frames(detector),
+        media_type="multipart/x-mixed-replace; boundary=frame",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+async def detection_events(detector):
+    last_frame_id = 0
+    while detector.is_running:
+        result = await detector.wait_for_result_async(last_frame_id)
+        if result is None:
+            # Comment line keeps proxies from closing an idle stream
+            yield ": keep-alive\n\n"
+            continue
+        last_frame_id = result['frame_id']
+        payload = {
+            "detections": result['detections'],
+            "frame_id": result['frame_id'],
+            "camera_id": detector.camera_id,
+            "timestamp": result['timestamp']
+        }
+        yield f"data: {json.dumps(payload)}\n\n"
+
+def events_response(detector):
+    return StreamingResponse(
+        detection_events(detector),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+def compact_detection_message(result, camera_id, skipped_frames):
+    """Build the small JSON message sent next to each WebSocket frame"""
+    return {
+        "type": "detections",
+        "camera_id": camera_id,
+        "frame_id": result['frame_id'],
+        "timestamp": result['timestamp'],
+        "skipped_frames": skipped_frames,
+        "detections": [
+            {
+                "bbox": [round(v, 1) for v in d['bbox']],
+                "confidence": round(d['confidence'], 3),
+                "track_id": d['track_id'],
+                "keypoints": d.get('keypoints'),
+            }
+            for d in result['detections']
+        ]
+    }
+
+async def push_live_results(websocket, camera_id, frames):
+    """Push a binary JPEG and a JSON detection message for every new result.
+
+    Only the newest result is ever sent: while a send to a slow client is
+    still in flight, newer frames replace each other and are skipped instead
+    of queuing up for that connection.
+    """
+    await websocket.accept()
+
+    detector = camera_manager.get(camera_id)
+    if detector is None:
+        await websocket.close(code=1013, reason="Live detection not running")
+        return
+
+    last_frame_id = 0
+    try:
+        while detector.is_running:
+            result = await detector.wait_for_result_async(last_frame_id)
+            if result is None:
+                continue
+            skipped_frames = result['frame_id'] - last_frame_id - 1 if last_frame_id else 0
+            last_frame_id = result['frame_id']
+
+            if frames:
+                await websocket.send_bytes(result['jpeg'])
+            await websocket.send_text(json.dumps(compact_detection_message(result, camera_id, skipped_frames)))
+
+        await websocket.close(code=1001, reason="Live detection stopped")
+    except WebSocketDisconnect:
+        pass
+
+def camera_status(camera_id):
+    detector = camera_manager.get(camera_id)
+    
+    if detector is None:
+        return {"running": False, "camera_id": camera_id}
     
+    return {"running": True, "camera_id": camera_id, **detector.get_stats()}
+
+@app.get("/live/start")
+def start_live_detection():
+    camera = get_default_camera_or_404()
+    if not camera['enabled']:
+        raise HTTPException(status_code=400, detail=f"Camera {camera['id']} is disabled")
+    return start_camera(camera['id'], get_camera_source_for(camera))
+
+@app.get("/live/stop")
+def stop_live_detection():
+    return stop_camera(get_default_camera_id())
+
+@app.get("/live/frame")
+def get_live_frame():
+    return latest_frame_response(get_running_detector(get_default_camera_id()))
+
+@app.get("/live/stream.mjpg")
+def stream_live_mjpeg():
+    return mjpeg_response(get_running_detector(get_default_camera_id()))
+
+@app.get("/live/events")
+def stream_live_events():
+    return events_response(get_running_detector(get_default_camera_id()))
+
+@app.websocket("/live/ws")
+async def live_websocket(websocket: WebSocket, frames: bool = True):
+    await push_live_results(websocket, get_default_camera_id(), frames)
+
+@app.get("/live/status")
+def get_live_status():
+    return camera_status(get_default_camera_id())
+
 @app.get("/live/stream-url")
 def get_stream_url():
-    camera_source = get_camera_source()
+    camera_source = get_camera_source_for(get_default_camera_or_404())
     return {
         "rtsp_url": camera_source if isinstance(camera_source, str) else None,
         "camera_source": "webcam" if isinstance(camera_source, int) else "rtsp",
@@ -288,6 +656,130 @@ def get_stream_url():
         "status": "success"
     }
 
+CAMERA_SOURCE_TYPES = ('rtsp', 'webcam', 'file')
+
+def get_camera_or_404(camera_id):
+    camera = get_camera(camera_id)
+    if camera is None:
+        raise HTTPException(status_code=404, detail=f"Camera {camera_id} not found")
+    return camera
+
+@app.get("/live/{camera_id}/start")
+def start_camera_detection(camera_id: int):
+    camera = get_camera_or_404(camera_id)
+    if not camera['enabled']:
+        raise HTTPException(status_code=400, detail=f"Camera {camera_id} is disabled")
+    return start_camera(camera_id, get_camera_source_for(camera))
+
+@app.get("/live/{camera_id}/stop")
+def stop_camera_detection(camera_id: int):
+    return stop_camera(camera_id)
+
+@app.get("/live/{camera_id}/frame")
+def get_camera_frame(camera_id: int):
+    return latest_frame_response(get_running_detector(camera_id))
+
+@app.get("/live/{camera_id}/stream.mjpg")
+def stream_camera_mjpeg(camera_id: int):
+    return mjpeg_response(get_running_detector(camera_id))
+
+@app.get("/live/{camera_id}/events")
+def stream_camera_events(camera_id: int):
+    return events_response(get_running_detector(camera_id))
+
+@app.websocket("/live/{camera_id}/ws")
+async def camera_websocket(websocket: WebSocket, camera_id: int, frames: bool = True):
+    await push_live_results(websocket, camera_id, frames)
+
+@app.get("/live/{camera_id}/status")
+def get_camera_status(camera_id: int):
+    return camera_status(camera_id)
+
+# ==================== ALERT ENDPOINTS ====================
+
+@app.get("/alerts/stats")
+def get_alert_stats():
+    """Queue depth, delivery counts and detection-to-hand-off latency per channel"""
+    return alert_dispatcher.get_stats()
+
+@app.get("/alerts/deliveries")
+def list_alert_deliveries(limit: int = 50, channel: str = None):
+    return {"data": get_alert_deliveries(limit, channel)}
+
+# ==================== CAMERA ENDPOINTS ====================
+
+@app.get("/inference/scheduler")
+def get_scheduler_status():
+    scheduler = camera_manager.scheduler
+    if scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **scheduler.get_stats()}
+
+@app.get("/cameras")
+def list_cameras():
+    running = set(camera_manager.running_camera_ids())
+    cameras = get_all_cameras()
+    for camera in cameras:
+        camera['running'] = camera['id'] in running
+    return {
+        "cameras": cameras,
+        "count": len(cameras)
+    }
+
+@app.get("/cameras/{camera_id}")
+def get_camera_details(camera_id: int):
+    camera = get_camera_or_404(camera_id)
+    camera['running'] = camera_manager.get(camera_id) is not None
+    return camera
+
+@app.post("/cameras")
+def add_camera(camera: dict):
+    if not camera.get('name'):
+        raise HTTPException(status_code=400, detail="Camera name is required")
+    if camera.get('source_type', 'rtsp') not in CAMERA_SOURCE_TYPES:
+        raise HTTPException(status_code=400, detail="source_type must be 'rtsp', 'webcam' or 'file'")
+    
+    camera_id = create_camera(
+        name=camera['name'],
+        source_type=camera.get('source_type', 'rtsp'),
+        url=camera.get('url', ''),
+        camera_index=camera.get('camera_index', 0),
+        location=camera.get('location', ''),
+        enabled=camera.get('enabled', True)
+    )
+    return {
+        "success": True,
+        "camera_id": camera_id,
+        "message": f"Camera '{camera['name']}' added"
+    }
+
+@app.put("/cameras/{camera_id}")
+def edit_camera(camera_id: int, camera: dict):
+    if camera.get('source_type', 'rtsp') not in CAMERA_SOURCE_TYPES:
+        raise HTTPException(status_code=400, detail="source_type must be 'rtsp', 'webcam' or 'file'")
+    if not update_camera(camera_id, **camera):
+        raise HTTPException(status_code=404, detail=f"Camera {camera_id} not found")
+    if camera_id == get_default_camera_id():
+        sync_camera_settings()
+    return {
+        "success": True,
+        "message": f"Camera {camera_id} updated — restart its live detection to apply source changes"
+    }
+
+@app.delete("/cameras/{camera_id}")
+def remove_camera(camera_id: int):
+    camera_manager.stop(camera_id)
+    was_default = camera_id == get_default_camera_id()
+    if not delete_camera(camera_id):
+        raise HTTPException(status_code=404, detail=f"Camera {camera_id} not found")
+    if was_default:
+        # The next camera becomes the default one
+        sync_camera_settings()
+    return {
+        "success": True,
+        "message": f"Camera {camera_id} deleted"
+    }
+
 # ==================== DATABASE/LOGS ENDPOINTS ====================
 
 @app.get("/logs/list")
@@ -402,6 +894,10 @@ def get_settings():
         "settings": settings
     }
 
+@app.get("/settings/version")
+def get_settings_version():
+    return {"version": settings_cache.get_version()}
+
 @app.get("/settings/raw")
 def get_raw_settings():
     settings = get_all_settings()
@@ -427,7 +923,8 @@ def update_settings(settings: dict):
         return {
             "success": True,
             "message": f"Updated {updated_count} settings",
-            "updated_count": updated_count
+            "updated_count": updated_count,
+            "version": settings_cache.get_version()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update settings: {str(e)}")
@@ -466,6 +963,26 @@ def get_analytics_summary():
         "recent_24h": stats['recent_24h'],
     }
 
+def dashboard_etag(version, date_from, date_to, recent_limit):
+    """Weak ETag for the dashboard; the hour is included because the today/week/24h windows roll over"""
+    return f'W/"{version}-{date_from}-{date_to}-{recent_limit}-{datetime.now().strftime("%Y%m%d%H")}"'
+
+@app.get("/analytics/dashboard")
+def analytics_dashboard(request: Request, date_from: str = None, date_to: str = None, recent_limit: int = 5):
+    """All dashboard widgets in one response, 304 when detections haven't changed"""
+    today = datetime.now().date()
+    date_to = date_to or today.isoformat()
+    date_from = date_from or (today - timedelta(days=6)).isoformat()
+
+    etag = dashboard_etag(get_detections_version(), date_from, date_to, recent_limit)
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    data = get_dashboard_data(date_from, date_to, recent_limit)
+    etag = dashboard_etag(data.pop("version"), date_from, date_to, recent_limit)
+    return JSONResponse(content=data, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
 @app.get("/analytics/falls-per-day")
 def falls_per_day(days: int = 7):
     return {"data": get_falls_per_day(days)}
@@ -506,12 +1023,10 @@ def generate_analytics_report(date_from: str, date_to: str):
         'last_fall_fmt': last_fall_fmt,
     }
 
-    diff_days = (datetime.fromisoformat(date_to) - datetime.fromisoformat(date_from)).days + 1
-    all_per_day = get_falls_per_day(diff_days)
-    falls_per_day_data = [d for d in all_per_day if d['day'] >= date_from and d['day'] <= date_to]
+    falls_per_day_data = get_falls_per_day_in_range(date_from, date_to)
 
     detections = get_falls_in_range(date_from, date_to)
-    org_name = get_setting('organization_name', 'CAIRE Healthcare')
+    org_name = settings_cache.get('organization_name', 'CAIRE Healthcare')
 
     pdf_bytes = generate_report(date_from, date_to, summary, falls_per_day_data, detections, org_name)
 
@@ -0,0 +1,96 @@
+import threading
+
+from live_detection import LiveDetector
+from settings_cache import settings_cache
+
+
+class CameraManager:
+    """Keeps one LiveDetector per camera, all sharing the same loaded models"""
+
+    def __init__(self, model=None, pose_model=None):
+        self.model = model
+        self.pose_model = pose_model
+        self.detectors = {}
+        self.scheduler = None
+        self.lock = threading.Lock()
+
+    def get_scheduler(self):
+        """Shared batch scheduler when batched inference is enabled in settings, else None"""
+        if not settings_cache.get_bool('inference_batching_enabled', False):
+            return None
+
+        batch_size = settings_cache.get_int('inference_batch_size', 4)
+        max_wait_ms = settings_cache.get_float('inference_max_wait_ms', 25)
+
+        if self.scheduler is None:
+            from inference_scheduler import BatchInferenceScheduler
+            self.scheduler = BatchInferenceScheduler(self.model, self.pose_model, batch_size, max_wait_ms)
+            self.scheduler.start()
+        else:
+            self.scheduler.configure(batch_size, max_wait_ms)
+        return self.scheduler
+
+    def swap_models(self, model=None, pose_model=None):
+        """Hand newly loaded models to the scheduler and every running detector"""
+        with self.lock:
+            if model is not None:
+                self.model = model
+            if pose_model is not None:
+                self.pose_model = pose_model
+            detectors = list(self.detectors.values())
+            if self.scheduler is not None:
+                self.scheduler.swap_models(model, pose_model)
+        for detector in detectors:
+            detector.swap_models(model, pose_model)
+
+    def start(self, camera_id, camera_source):
+        """Start detection for a camera, returns (detector, status)"""
+        with self.lock:
+            detector = self.detectors.get(camera_id)
+            if detector and detector.is_running:
+                return detector, "already_running"
+
+            scheduler = self.get_scheduler()
+            detector = LiveDetector(self.model, camera_source, self.pose_model,
+                                    camera_id=camera_id, scheduler=scheduler)
+            if not detector.connect_camera():
+                # Drops its settings subscription and whatever the failed connect opened
+                detector.stop()
+                return detector, "error"
+
+            if scheduler is not None:
+                scheduler.register(camera_id)
+
+            detector.start()
+            self.detectors[camera_id] = detector
+            return detector, "success"
+
+    def stop(self, camera_id):
+        """Stop detection for a camera, returns False if it wasn't running"""
+        with self.lock:
+            detector = self.detectors.pop(camera_id, None)
+        if detector is None:
+            return False
+        detector.stop()
+        if detector.scheduler is not None:
+            detector.scheduler.unregister(camera_id)
+        return True
+
+    def stop_all(self):
+        with self.lock:
+            detectors = list(self.detectors.values())
+            self.detectors.clear()
+        for detector in detectors:
+            detector.stop()
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+
+    def get(self, camera_id):
+        detector = self.detectors.get(camera_id)
+        if detector and detector.is_running:
+            return detector
+        return None
+
+    def running_camera_ids(self):
+        return [camera_id for camera_id, detector in list(self.detectors.items()) if detector.is_running]
@@ -0,0 +1,176 @@
+import cv2
+import os
+import threading
+import time
+
+from metrics import metrics
+
+CAPTURE_READ_MS = metrics.histogram('fall_capture_read_ms', 'Time to read one frame from the camera')
+
+
+class CameraStream:
+    """Reads frames on its own thread and keeps only the freshest one.
+
+    Inference always gets the newest frame instead of whatever is queued in
+    OpenCV's internal buffer. Frames that are overwritten before being read
+    are counted as dropped. Live sources reconnect with exponential backoff
+    when the stream stalls; video files loop at their native fps so they can
+    stand in for a camera.
+    """
+
+    def __init__(self, source, reconnect_delay=1.0, max_reconnect_delay=30.0, read_timeout=5.0, name=None):
+        self.source = source
+        self.name = name or str(source)
+        self.is_file = isinstance(source, str) and os.path.isfile(source)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.read_timeout = read_timeout
+
+        self.cap = None
+        self.fps = None
+        self.is_running = False
+        self.thread = None
+        self.condition = threading.Condition()
+        self.frame = None
+        self.frame_id = 0
+        self.last_read_id = 0
+        self.last_frame_time = None
+
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.reconnects = 0
+
+    def open(self):
+        """Open the capture device, returns True on success"""
+        if self.cap is not None:
+            self.cap.release()
+
+        if isinstance(self.source, int):
+            cap = cv2.VideoCapture(self.source)
+        elif self.is_file:
+            cap = cv2.VideoCapture(self.source)
+        else:
+            timeout_ms = int(self.read_timeout * 1000)
+            cap = cv2.VideoCapture(self.source, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+                cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms,
+            ])
+
+        if not cap.isOpened():
+            cap.release()
+            self.cap = None
+            return False
+
+        if not self.is_file:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else None
+        self.cap = cap
+        return True
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self.thread.start()
+
+    def _capture_loop(self):
+        delay = self.reconnect_delay
+        frame_interval = 1.0 / self.fps if self.is_file and self.fps else 0
+        next_frame_at = time.monotonic()
+
+        while self.is_running:
+            if self.cap is None:
+                if self._reconnect(delay):
+                    delay = self.reconnect_delay
+                    frame_interval = 1.0 / self.fps if self.is_file and self.fps else 0
+                    next_frame_at = time.monotonic()
+                else:
+                    delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            started = time.perf_counter()
+            ret, frame = self.cap.read()
+            CAPTURE_READ_MS.observe((time.perf_counter() - started) * 1000, camera=self.name)
+
+            if not ret:
+                if self.is_file:
+                    # Loop the video so it behaves like an endless camera feed
+                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    ret, frame = self.cap.read()
+                if not ret:
+                    print("Camera stream stalled, reconnecting...")
+                    self.cap.release()
+                    self.cap = None
+                    continue
+
+            self._publish(frame)
+
+            if frame_interval:
+                next_frame_at += frame_interval
+                sleep_for = next_frame_at - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    next_frame_at = time.monotonic()
+
+    def _reconnect(self, delay):
+        print(f"Reconnecting to camera in {delay:.0f}s...")
+        deadline = time.monotonic() + delay
+        while self.is_running and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if not self.is_running:
+            return False
+
+        self.reconnects += 1
+        if self.open():
+            print("Camera reconnected!")
+            return True
+        return False
+
+    def _publish(self, frame):
+        with self.condition:
+            if self.frame is not None and self.frame_id != self.last_read_id:
+                self.frames_dropped += 1
+            self.frame = frame
+            self.frame_id += 1
+            self.frames_captured += 1
+            self.last_frame_time = time.time()
+            self.condition.notify_all()
+
+    def read(self, timeout=1.0):
+        """Wait for a frame newer than the last one read, returns None on timeout"""
+        with self.condition:
+            if not self.condition.wait_for(
+                lambda: self.frame_id != self.last_read_id or not self.is_running,
+                timeout=timeout
+            ):
+                return None
+            if not self.is_running:
+                return None
+            self.last_read_id = self.frame_id
+            return self.frame
+
+    def get_stats(self):
+        return {
+            "source_type": "file" if self.is_file else ("webcam" if isinstance(self.source, int) else "rtsp"),
+            "connected": self.cap is not None,
+            "fps": self.fps,
+            "frames_captured": self.frames_captured,
+            "frames_dropped": self.frames_dropped,
+            "reconnects": self.reconnects,
+            "last_frame_time": self.last_frame_time,
+        }
+
+    def stop(self):
+        self.is_running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+        self.thread = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
@@ -0,0 +1,104 @@
+import importlib.util
+from pathlib import Path
+
+# Backend name -> (Ultralytics export format, runtime module it needs, INT8 quantized)
+BACKENDS = {
+    'pytorch': (None, None, False),
+    'onnx': ('onnx', 'onnxruntime', False),
+    'openvino': ('openvino', 'openvino', False),
+    'onnx-int8': ('onnx', 'onnxruntime', True),
+    'openvino-int8': ('openvino', 'openvino', True),
+}
+
+
+def backend_available(backend):
+    """True if the runtime for a backend is installed"""
+    _, runtime, _ = BACKENDS[backend]
+    return runtime is None or importlib.util.find_spec(runtime) is not None
+
+
+def artifact_path(weights_path, backend):
+    """Where the exported model for a backend lives, next to the .pt file like Ultralytics writes it"""
+    weights_path = Path(weights_path)
+    export_format, _, quantized = BACKENDS[backend]
+    tag = "_int8" if quantized else ""
+    if export_format == 'onnx':
+        return weights_path.with_name(f"{weights_path.stem}{tag}.onnx")
+    if export_format == 'openvino':
+        return weights_path.parent / f"{weights_path.stem}{tag}_openvino_model"
+    return weights_path
+
+
+def is_current(weights_path, backend):
+    """True if the export for a backend exists and is newer than the weights"""
+    target = artifact_path(weights_path, backend)
+    return target.exists() and target.stat().st_mtime >= Path(weights_path).stat().st_mtime
+
+
+def export_model(weights_path, backend, imgsz=640, force=False, **calibration):
+    """Export .pt weights for a backend unless a current export exists, returns its path.
+
+    INT8 backends also need calibration arguments for Ultralytics (data,
+    split, fraction); scripts/quantize_fall_model.py passes them.
+    """
+    weights_path = Path(weights_path)
+    if not force and is_current(weights_path, backend):
+        return artifact_path(weights_path, backend)
+
+    from ultralytics import YOLO
+
+    export_format, _, quantized = BACKENDS[backend]
+    # Dynamic shapes keep batched inference working and allow the same rectangular
+    # letterbox PyTorch uses for 640x360 frames
+    export_args = dict(format=export_format, imgsz=imgsz, dynamic=True)
+    if quantized:
+        export_args.update(quantize=8, **calibration)
+
+    print(f"📦 Exporting {weights_path.name} to {backend}...")
+    exported = YOLO(str(weights_path)).export(**export_args)
+    return Path(exported)
+
+
+def resolve_model(weights_path, backend):
+    """The file to load for a backend as (path, backend actually used).
+
+    Exports and caches the artifact on first use. Falls back to PyTorch when
+    the backend is unknown, its runtime isn't installed or the weights aren't
+    a .pt file, so a bad setting never stops detection. INT8 models are never
+    exported here since they have to be calibrated and validated first; without
+    a current one the same runtime's FP32 export is used instead.
+    """
+    if backend not in BACKENDS:
+        print(f"⚠️ Unknown inference backend '{backend}', using PyTorch")
+        return Path(weights_path), 'pytorch'
+    if backend == 'pytorch':
+        return Path(weights_path), backend
+
+    export_format, runtime, quantized = BACKENDS[backend]
+    if not backend_available(backend):
+        print(f"⚠️ {runtime} is not installed, using PyTorch for {weights_path}")
+        return Path(weights_path), 'pytorch'
+    if Path(weights_path).suffix != '.pt' or not Path(weights_path).is_file():
+        print(f"⚠️ Only .pt weights can be exported, using PyTorch for {weights_path}")
+        return Path(weights_path), 'pytorch'
+
+    if quantized:
+        if is_current(weights_path, backend):
+            return artifact_path(weights_path, backend), backend
+        print(f"⚠️ No INT8 model for {weights_path} (run scripts/quantize_fall_model.py), using {export_format}")
+        return resolve_model(weights_path, export_format)
+
+    return export_model(weights_path, backend), backend
+
+
+def load_model(weights_path, backend='pytorch'):
+    """Load a model for a backend, returns (YOLO model, path loaded, backend used).
+
+    Exported models are still Ultralytics YOLO objects, so predict(), track()
+    and the Results they return look the same to the rest of the code.
+    """
+    from ultralytics import YOLO
+
+    path, backend = resolve_model(weights_path, backend)
+    # Exports carry the task (detect, pose) in their metadata
+    return YOLO(str(path)), path, backend
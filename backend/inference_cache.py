@@ -0,0 +1,154 @@
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Detections are cached from this confidence up, so any higher threshold can be served by filtering
+CACHE_CONFIDENCE = 0.1
+# Bumped when the entry layout changes, older entries are then never read and age out
+CACHE_FORMAT = 2
+
+
+def file_fingerprint(path, chunk_size=1024 * 1024):
+    """Short sha256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class CachedDetections:
+    """Untracked per-box arrays for one video: frame, class, confidence and box.
+
+    Boxes are stored before tracking, so a job at any threshold can track
+    the boxes it keeps itself and get the same ids as a fresh run.
+    """
+
+    def __init__(self, frames, classes, confidences, boxes, total_frames, fps, min_confidence):
+        self.frames = frames
+        self.classes = classes
+        self.confidences = confidences
+        self.boxes = boxes
+        self.total_frames = total_frames
+        self.fps = fps
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def from_rows(cls, rows, total_frames, fps, min_confidence):
+        """rows are (frame, class_id, confidence, x1, y1, x2, y2) in frame order"""
+        return cls(
+            np.array([r[0] for r in rows], dtype=np.int32),
+            np.array([r[1] for r in rows], dtype=np.int16),
+            np.array([r[2] for r in rows], dtype=np.float32),
+            np.array([r[3:7] for r in rows], dtype=np.float32).reshape(-1, 4),
+            total_frames, fps, min_confidence,
+        )
+
+    def frame_boxes(self, frame_index):
+        """Boxes of one frame as an (N, 6) array of x1, y1, x2, y2, confidence, class"""
+        start, end = np.searchsorted(self.frames, [frame_index, frame_index + 1])
+        return np.column_stack([self.boxes[start:end], self.confidences[start:end], self.classes[start:end]])
+
+
+class InferenceCache:
+    """Untracked detections of uploaded videos on disk, keyed by content hash and model version.
+
+    Entries are compressed .npz files. Reading an entry touches its mtime so
+    eviction can drop the least recently used files once the cache grows
+    past max_bytes.
+    """
+
+    def __init__(self, cache_dir, model_version, max_bytes=500 * 1024 * 1024):
+        # Created on the first put, so importing the app doesn't write to disk
+        self.cache_dir = Path(cache_dir)
+        self.model_version = model_version
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, content_hash):
+        return self.cache_dir / f"{content_hash}_{self.model_version}_v{CACHE_FORMAT}.npz"
+
+    def get(self, content_hash, confidence):
+        """Cached detections for a video, or None if missing or cached above the requested confidence.
+
+        Requests below CACHE_CONFIDENCE can never be served from the cache
+        and aren't counted as hits or misses.
+        """
+        if confidence < CACHE_CONFIDENCE:
+            return None
+        path = self.path_for(content_hash)
+        try:
+            with np.load(path) as data:
+                cached = CachedDetections(
+                    data["frames"], data["classes"], data["confidences"], data["boxes"],
+                    int(data["total_frames"]), float(data["fps"]), float(data["min_confidence"]),
+                )
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            cached = None
+
+        with self.lock:
+            if cached is None or cached.min_confidence > confidence:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return cached
+
+    def put(self, content_hash, cached):
+        path = self.path_for(content_hash)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer, two jobs on the same video may finish at the same time
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f"{path.stem}.", suffix=".partial",
+                                         delete=False) as f:
+            tmp_path = Path(f.name)
+            try:
+                np.savez_compressed(
+                    f,
+                    frames=cached.frames, classes=cached.classes,
+                    confidences=cached.confidences, boxes=cached.boxes,
+                    total_frames=cached.total_frames, fps=cached.fps, min_confidence=cached.min_confidence,
+                )
+            except BaseException:
+                f.close()
+                tmp_path.unlink(missing_ok=True)
+                raise
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        with self.lock:
+            entries = []
+            for path in self.cache_dir.glob("*.npz"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+    def get_stats(self):
+        entries = list(self.cache_dir.glob("*.npz"))
+        return {
+            "model_version": self.model_version,
+            "entries": len(entries),
+            "size_bytes": sum(path.stat().st_size for path in entries if path.exists()),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,205 @@
+import threading
+import time
+from pathlib import Path
+
+import torch
+import yaml
+from ultralytics.trackers.byte_tracker import BYTETracker
+from ultralytics.utils import IterableSimpleNamespace
+
+from metrics import metrics
+from model_registry import clone_model
+
+TRACKER_CONFIG = Path(__file__).parent / "bytetrack.yaml"
+
+INFERENCE_MS = metrics.histogram('fall_inference_ms', 'Model inference time per frame, or per batch when batching')
+BATCH_SIZE = metrics.histogram('fall_inference_batch_size', 'Frames per batched inference',
+                               buckets=(1, 2, 3, 4, 6, 8, 12, 16))
+
+
+def create_tracker():
+    """Create a ByteTrack tracker with the same config model.track() uses"""
+    with open(TRACKER_CONFIG) as f:
+        cfg = IterableSimpleNamespace(**yaml.safe_load(f))
+    return BYTETracker(args=cfg)
+
+
+def apply_tracker(tracker, result):
+    """Run one camera's tracker on a detection result, same as ultralytics does after model.track()"""
+    det = result.boxes.cpu().numpy()
+    tracks = tracker.update(det, result.orig_img)
+    if len(tracks) == 0:
+        # Like model.track(): detections stay untouched, unless a new track is
+        # still waiting to be confirmed, in which case they are hidden for now
+        if any(not track.is_activated for track in tracker.tracked_stracks):
+            return result[:0]
+        return result
+    result = result[tracks[:, -1].astype(int)]
+    result.update(boxes=torch.as_tensor(tracks[:, :-1]))
+    return result
+
+
+class InferenceRequest:
+    def __init__(self, camera_id, frame, conf):
+        self.camera_id = camera_id
+        self.frame = frame
+        self.conf = conf
+        self.done = threading.Event()
+        self.result = None
+        self.pose_result = None
+        self.error = None
+
+
+class BatchInferenceScheduler:
+    """Runs the fall and pose models once per batch of frames from all cameras.
+
+    Each camera's detector submits its latest frame and blocks until the
+    batch it ended up in has been inferred. A batch is closed when it holds
+    one frame from every registered camera, reaches batch_size, or the first
+    frame has waited max_wait_ms. Detection results are then passed through
+    the submitting camera's own ByteTrack tracker.
+    """
+
+    def __init__(self, model, pose_model=None, batch_size=4, max_wait_ms=25):
+        self.model = clone_model(model)
+        self.pose_model = clone_model(pose_model) if pose_model is not None else None
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.condition = threading.Condition()
+        self.pending = []
+        self.trackers = {}
+        self.is_running = False
+        self.thread = None
+
+        self.batches_run = 0
+        self.frames_inferred = 0
+        self.last_batch_ms = None
+
+    def configure(self, batch_size, max_wait_ms):
+        with self.condition:
+            self.batch_size = batch_size
+            self.max_wait = max_wait_ms / 1000
+
+    def swap_models(self, model=None, pose_model=None):
+        """Use newly loaded models from the next batch on"""
+        with self.condition:
+            if model is not None:
+                self.model = clone_model(model)
+            if pose_model is not None:
+                self.pose_model = clone_model(pose_model)
+
+    def register(self, camera_id):
+        with self.condition:
+            self.trackers[camera_id] = create_tracker()
+
+    def unregister(self, camera_id):
+        with self.condition:
+            self.trackers.pop(camera_id, None)
+            self.condition.notify_all()
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self._batch_loop, name="batch-inference", daemon=True)
+        self.thread.start()
+
+    def infer(self, camera_id, frame, conf, timeout=30):
+        """Submit a frame and wait for its (tracked detection result, pose result)"""
+        request = InferenceRequest(camera_id, frame, conf)
+        with self.condition:
+            if not self.is_running:
+                raise RuntimeError("Inference scheduler is not running")
+            self.pending.append(request)
+            self.condition.notify_all()
+
+        if not request.done.wait(timeout):
+            raise TimeoutError("Batched inference timed out")
+        if request.error is not None:
+            raise request.error
+        return request.result, request.pose_result
+
+    def _next_batch(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending or not self.is_running)
+            if not self.is_running:
+                return []
+
+            deadline = time.monotonic() + self.max_wait
+            expected = min(self.batch_size, max(len(self.trackers), 1))
+            while len(self.pending) < expected and self.is_running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+                expected = min(self.batch_size, max(len(self.trackers), 1))
+
+            batch = self.pending[:self.batch_size]
+            del self.pending[:self.batch_size]
+            return batch
+
+    def _batch_loop(self):
+        while self.is_running:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                print(f"Batched inference error: {e}")
+                for request in batch:
+                    request.error = e
+            finally:
+                for request in batch:
+                    request.done.set()
+
+    def _run_batch(self, batch):
+        started = time.perf_counter()
+        frames = [request.frame for request in batch]
+        conf = min(request.conf for request in batch)
+
+        results = self.model.predict(frames, conf=conf, iou=0.3, verbose=False)
+        inferred = time.perf_counter()
+        INFERENCE_MS.observe((inferred - started) * 1000, model='fall')
+        if self.pose_model is not None:
+            pose_results = self.pose_model(frames, conf=conf, verbose=False, show=False)
+            INFERENCE_MS.observe((time.perf_counter() - inferred) * 1000, model='pose')
+        else:
+            pose_results = [None] * len(batch)
+
+        for request, result, pose_result in zip(batch, results, pose_results):
+            if request.conf > conf:
+                result = result[result.boxes.conf >= request.conf]
+            tracker = self.trackers.get(request.camera_id)
+            if tracker is not None:
+                result = apply_tracker(tracker, result)
+            request.result = result
+            request.pose_result = pose_result
+
+        BATCH_SIZE.observe(len(batch))
+        self.batches_run += 1
+        self.frames_inferred += len(batch)
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+
+    def get_stats(self):
+        return {
+            "batch_size": self.batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "cameras": len(self.trackers),
+            "batches_run": self.batches_run,
+            "frames_inferred": self.frames_inferred,
+            "avg_batch_size": self.frames_inferred / self.batches_run if self.batches_run else 0,
+            "last_batch_ms": self.last_batch_ms,
+        }
+
+    def stop(self):
+        with self.condition:
+            self.is_running = False
+            pending, self.pending = self.pending, []
+            self.condition.notify_all()
+        for request in pending:
+            request.error = RuntimeError("Inference scheduler stopped")
+            request.done.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+        self.thread = None
@@ -1,13 +1,21 @@
+import asyncio
 import cv2
 import numpy as np
-from ultralytics import YOLO
-import base64
 from datetime import datetime
 from pathlib import Path
-import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+import time
+
+from alert_dispatcher import alert_dispatcher
+from model_registry import clone_model
+from camera_stream import CameraStream
+from metrics import metrics
+from settings_cache import settings_cache
+from video_pipeline import result_arrays
+
+STAGE_MS = metrics.histogram('fall_live_stage_ms', 'Time spent in each stage of live detection')
+INFERENCE_MS = metrics.histogram('fall_inference_ms', 'Model inference time per frame, or per batch when batching')
+FRAMES_PROCESSED = metrics.counter('fall_frames_processed_total', 'Frames run through live detection')
 
 SKELETON_CONNECTIONS = [
     (5, 6),
@@ -40,116 +48,149 @@ def get_keypoint_center(kp_array):
     cy = sum(p[1] for p in valid_points) / len(valid_points)
     return (cx, cy)
 
-def is_skeleton_inside_bbox(kp_array, bbox, threshold=0.5):
-    x1, y1, x2, y2 = bbox
-    total = 0
-    inside = 0
-    for x, y in kp_array:
-        if x > 0 and y > 0:
-            total += 1
-            if x1 <= x <= x2 and y1 <= y <= y2:
-                inside += 1
-    if total == 0:
-        return False
-    return (inside / total) >= threshold
-
-def send_sms_alert(phone_number):
-    """Send SMS alert via Semaphore when a fall is detected"""
-    try:
-        import requests
-
-        api_key = os.getenv('SEMAPHORE_API_KEY')
-
-        if not api_key:
-            print("Semaphore API key not configured in .env")
-            return False
-
-        if not phone_number:
-            print("No recipient phone number configured in settings")
-            return False
-
-        url = "https://api.semaphore.co/api/v4/messages"
-        payload = {
-            "apikey": api_key,
-            "number": phone_number,
-            "message": "A fall has been detected, please respond immediately.",
-            "sendername": "CAIRE"
-        }
-
-        response = requests.post(url, data=payload)
-        result = response.json()
-
-        print(f"SMS sent! Response: {result}")
-        return True
-
-    except Exception as e:
-        print(f"Failed to send SMS: {e}")
-        return False
-
-def send_email_alert(recipient_email):
-    """Send email alert via Gmail SMTP when a fall is detected"""
-    try:
-        sender_email = os.getenv('EMAIL_SENDER')
-        app_password = os.getenv('EMAIL_APP_PASSWORD')
-
-        if not sender_email or not app_password:
-            print("Email credentials not configured in .env")
-            return False
-
-        if not recipient_email:
-            print("No recipient email configured in settings")
-            return False
-
-        timestamp = datetime.now().strftime("%B %d, %Y at %I:%M:%S %p")
-
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        msg['Subject'] = "CAIRE Alert: Fall Detected"
-
-        body = f"""A fall has been detected, please respond immediately.
-
-Detection Time: {timestamp}
-
-This is an automated alert from the CAIRE Fall Detection System."""
-
-        msg.attach(MIMEText(body, 'plain'))
-
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(sender_email, app_password)
-            server.sendmail(sender_email, recipient_email, msg.as_string())
-
-        print(f"Email alert sent successfully to {recipient_email}")
-        return True
-
-    except Exception as e:
-        print(f"Failed to send email: {e}")
-        return False
+def fall_class_mask(names):
+    """Bool array indexed by class id, True for the fall classes of a model"""
+    mask = np.zeros(max(names) + 1, dtype=bool)
+    for class_id, name in names.items():
+        mask[class_id] = 'fall' in name.lower()
+    return mask
+
+def box_arrays(results):
+    """Boxes of all results as NumPy (xyxy, confidences, class ids, track ids with -1 for untracked)"""
+    arrays = [result_arrays(r) for r in results if r is not None and len(r.boxes)]
+    if not arrays:
+        return np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, int), np.zeros(0, int)
+    xyxy, confidences, class_ids, track_ids = zip(*arrays)
+    track_ids = [ids if ids is not None else np.full(len(cls), -1) for ids, cls in zip(track_ids, class_ids)]
+    return np.concatenate(xyxy), np.concatenate(confidences), np.concatenate(class_ids), np.concatenate(track_ids)
+
+def keypoint_arrays(pose_results):
+    """Keypoints of all skeletons as NumPy (xy of shape (S, K, 2), confidences (S, K) or None)"""
+    data = [r.keypoints.data for r in pose_results if r is not None and r.keypoints is not None]
+    data = [d.cpu().numpy() if hasattr(d, 'cpu') else d for d in data]
+    if not data or not sum(len(d) for d in data):
+        return np.zeros((0, 17, 2), np.float32), None
+    data = np.concatenate(data)
+    return data[..., :2], (data[..., 2] if data.shape[-1] == 3 else None)
+
+def skeleton_box_matrix(keypoints_xy, boxes_xyxy, threshold=0.5):
+    """(skeletons, boxes) bool matrix, True where at least threshold of the
+    skeleton's visible keypoints lie inside the box"""
+    if len(keypoints_xy) == 0 or len(boxes_xyxy) == 0:
+        return np.zeros((len(keypoints_xy), len(boxes_xyxy)), dtype=bool)
+    x = keypoints_xy[:, :, 0, None]
+    y = keypoints_xy[:, :, 1, None]
+    visible = (x > 0) & (y > 0)
+    x1, y1, x2, y2 = boxes_xyxy.T
+    # (skeletons, keypoints, boxes)
+    inside = visible & (x1 <= x) & (x <= x2) & (y1 <= y) & (y <= y2)
+    total = visible.sum(axis=1)
+    return (total > 0) & (inside.sum(axis=1) / np.maximum(total, 1) >= threshold)
+
+def postprocess(results, pose_results, names, fall_classes, fall_confidence, threshold=0.3):
+    """Fall detections and skeletons of one frame from the raw model results.
+
+    Returns (detections, skeletons), skeletons as (xy, confidences, is_fall).
+    A skeleton is a fall skeleton if it lies inside any fall box; each fall
+    box reports the keypoints of the first skeleton that matched it.
+    """
+    xyxy, confidences, class_ids, track_ids = box_arrays(results)
+    fall_index = np.flatnonzero(fall_classes[class_ids] & (confidences >= fall_confidence))
+    keypoints_xy, keypoints_conf = keypoint_arrays(pose_results)
+
+    matches = skeleton_box_matrix(keypoints_xy, xyxy[fall_index], threshold)
+    is_fall_skeleton = matches.any(axis=1)
+    # A skeleton counts for the first fall box it is inside
+    fall_keypoints = {}
+    for skeleton in np.flatnonzero(is_fall_skeleton):
+        fall_keypoints.setdefault(int(matches[skeleton].argmax()), skeleton)
+
+    detections = []
+    for rank, i in enumerate(fall_index):
+        skeleton = fall_keypoints.get(rank)
+        detections.append({
+            'bbox': xyxy[i].tolist(),
+            'confidence': float(confidences[i]),
+            'class': names[class_ids[i]],
+            'track_id': int(track_ids[i]) if track_ids[i] >= 0 else None,
+            'keypoints': np.round(keypoints_xy[skeleton].astype(float), 1).tolist() if skeleton is not None else None
+        })
+
+    skeletons = [(keypoints_xy[s], keypoints_conf[s] if keypoints_conf is not None else None, bool(is_fall_skeleton[s]))
+                 for s in range(len(keypoints_xy))]
+    return detections, skeletons
+
+def lap(timings, stage, since):
+    """Record milliseconds since `since` under stage, returns the new mark"""
+    now = time.perf_counter()
+    timings[stage] = (now - since) * 1000
+    return now
 
 class LiveDetector:
-    def __init__(self, model_path, camera_source, pose_model=None):
-        self.model = YOLO(model_path)
-        self.pose_model = pose_model
+    def __init__(self, model, camera_source, pose_model=None, camera_id=None, scheduler=None):
+        self.model = clone_model(model)
+        self.fall_classes = fall_class_mask(self.model.names)
+        self.pose_model = clone_model(pose_model) if pose_model is not None else None
+        self.scheduler = scheduler
         self.camera_source = camera_source
-        self.cap = None
+        self.camera_id = camera_id
+        self.stream = None
         self.is_running = False
         self.last_detection_time = None
         self.images_dir = Path(__file__).parent / "images"
         self.images_dir.mkdir(exist_ok=True)
         self.startup_time = None
         self.startup_cooldown = 7  # seconds
+        self.worker = None
+        self.result_condition = threading.Condition()
+        # (event loop, asyncio.Event) of streaming clients waiting for the next result
+        self.async_waiters = set()
+        self.latest_result = None
+        self.frame_id = 0
+        # Per-stage milliseconds of the last detect_frame call
+        self.last_timings = {}
+        self.metrics_label = 'default' if camera_id is None else str(camera_id)
+        self.processing_fps = None
+        self.last_frame_at = None
+        self.load_settings()
+        settings_cache.subscribe(self.on_setting_changed)
+
+    def load_settings(self):
+        """Copy the settings used on the frame path from the settings cache"""
+        self.fall_confidence = settings_cache.get_float('confidence_threshold', 0.75)
+        self.tracking_confidence = settings_cache.get_float('person_tracking_confidence', 0.45)
+        self.cooldown_seconds = settings_cache.get_int('cooldown_seconds', 30)
+        self.sms_enabled = settings_cache.get_bool('alert_sms_enabled', False)
+        self.phone_number = settings_cache.get('alert_phone_number', '')
+        self.email_enabled = settings_cache.get_bool('alert_email_enabled', False)
+        self.email_address = settings_cache.get('alert_email_address', '')
+
+    def swap_models(self, model=None, pose_model=None):
+        """Switch to newly loaded models, tracking starts over with fresh ids"""
+        if model is not None:
+            self.model = clone_model(model)
+            self.fall_classes = fall_class_mask(self.model.names)
+        if pose_model is not None:
+            self.pose_model = clone_model(pose_model)
+
+    def on_setting_changed(self, key, value):
+        self.load_settings()
 
     def connect_camera(self):
-        self.cap = cv2.VideoCapture(self.camera_source)
-        if self.cap.isOpened():
+        self.stream = CameraStream(self.camera_source, name=self.metrics_label)
+        if self.stream.open():
+            self.stream.start()
             self.is_running = True
             self.startup_time = datetime.now()
             if isinstance(self.camera_source, int):
                 print(f"Webcam connected! Index: {self.camera_source}")
+            elif self.stream.is_file:
+                print(f"Video file connected as camera: {self.camera_source}")
             else:
                 print(f"RTSP camera connected!")
             return True
         else:
+            self.stream = None
             if isinstance(self.camera_source, int):
                 print(f"Failed to connect to webcam at index {self.camera_source}")
             else:
@@ -159,177 +200,273 @@ class LiveDetector:
     def is_cooldown_active(self):
         if self.last_detection_time is None:
             return False
-        from database import get_setting
-        cooldown_seconds = int(get_setting('cooldown_seconds', '30'))
         time_since_last = (datetime.now() - self.last_detection_time).total_seconds()
-        return time_since_last < cooldown_seconds
+        return time_since_last < self.cooldown_seconds
 
     def save_detection_image(self, frame):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"fall_{timestamp}.jpg"
+        filename = f"fall_{timestamp}.jpg" if self.camera_id is None else f"fall_cam{self.camera_id}_{timestamp}.jpg"
         filepath = self.images_dir / filename
         cv2.imwrite(str(filepath), frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
         return filename
 
-    def draw_pose(self, frame, keypoints, color=(0, 255, 255)):
-        if keypoints is None:
-            return frame
-        kp_array = keypoints.xy[0].cpu().numpy()
-        kp_conf = keypoints.conf[0].cpu().numpy() if keypoints.conf is not None else None
-        for i, (x, y) in enumerate(kp_array):
-            if i < 5:
-                continue
-            if kp_conf is not None and kp_conf[i] < 0.3:
-                continue
-            if x > 0 and y > 0:
-                cv2.circle(frame, (int(x), int(y)), 4, color, -1)
-        for start_idx, end_idx in SKELETON_CONNECTIONS:
-            if start_idx >= len(kp_array) or end_idx >= len(kp_array):
-                continue
-            x1, y1 = kp_array[start_idx]
-            x2, y2 = kp_array[end_idx]
-            if kp_conf is not None:
-                if kp_conf[start_idx] < 0.3 or kp_conf[end_idx] < 0.3:
-                    continue
-            if x1 > 0 and y1 > 0 and x2 > 0 and y2 > 0:
-                cv2.line(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 2)
+    def draw_pose(self, frame, kp_array, kp_conf=None, color=(0, 255, 255)):
+        """Draw one skeleton from its (K, 2) keypoint array and (K,) confidences"""
+        visible = (kp_array[:, 0] > 0) & (kp_array[:, 1] > 0)
+        if kp_conf is not None:
+            visible &= kp_conf >= 0.3
+        points = kp_array.astype(np.int32)
+        for i in np.flatnonzero(visible[5:]) + 5:
+            cv2.circle(frame, (int(points[i, 0]), int(points[i, 1])), 4, color, -1)
+        lines = [points[[start_idx, end_idx]] for start_idx, end_idx in SKELETON_CONNECTIONS
+                 if end_idx < len(points) and start_idx < len(points) and visible[start_idx] and visible[end_idx]]
+        if lines:
+            cv2.polylines(frame, lines, False, color, 2)
         return frame
 
-    def detect_frame(self):
-        if not self.cap or not self.cap.isOpened():
-            return None, None, None
-
-        ret, frame = self.cap.read()
-        if not ret:
-            return None, None, None
-
-        frame_resized = cv2.resize(frame, (640, 360))
-
-        from database import get_setting
+    def run_models(self, frame, tracking_confidence, timings=None):
+        """Run pose estimation and fall tracking, returns (fall results, pose results)"""
+        timings = {} if timings is None else timings
+        mark = time.perf_counter()
+        if self.scheduler is not None:
+            result, pose_result = self.scheduler.infer(self.camera_id, frame, tracking_confidence)
+            lap(timings, 'inference', mark)
+            return [result], [pose_result]
 
-        fall_confidence = float(get_setting('confidence_threshold', '0.75'))
-        tracking_confidence = float(get_setting('person_tracking_confidence', '0.45'))
-
-        pose_keypoints = []
+        pose_results = []
         if self.pose_model is not None:
             pose_results = self.pose_model(
-                frame_resized,
+                frame,
                 conf=tracking_confidence,
                 verbose=False,
                 show=False
             )
-            for pose_r in pose_results:
-                if pose_r.keypoints is not None:
-                    for keypoints in pose_r.keypoints:
-                        pose_keypoints.append(keypoints)
+        mark = lap(timings, 'pose', mark)
 
         results = self.model.track(
-            frame_resized,
+            frame,
             conf=tracking_confidence,
             persist=True,
             verbose=False,
             tracker="bytetrack.yaml",
             iou=0.3,
         )
+        lap(timings, 'track', mark)
+        return results, pose_results
 
-        fall_bboxes = []
-        all_boxes = []
-
-        for r in results:
-            for box in r.boxes:
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                conf = float(box.conf[0])
-                cls = int(box.cls[0])
-                class_name = self.model.names[cls]
-                track_id = int(box.id[0]) if box.id is not None else None
-                is_fall = 'fall' in class_name.lower()
-
-                all_boxes.append({
-                    'bbox': [x1, y1, x2, y2],
-                    'conf': conf,
-                    'class_name': class_name,
-                    'track_id': track_id,
-                    'is_fall': is_fall and conf >= fall_confidence
-                })
-
-                if is_fall and conf >= fall_confidence:
-                    fall_bboxes.append([x1, y1, x2, y2])
-
-        for keypoints in pose_keypoints:
-            kp_array = keypoints.xy[0].cpu().numpy()
-            is_fall_skeleton = False
-            for fall_bbox in fall_bboxes:
-                if is_skeleton_inside_bbox(kp_array, fall_bbox, threshold=0.3):
-                    is_fall_skeleton = True
-                    break
-            color = (0, 0, 255) if is_fall_skeleton else (0, 255, 255)
-            frame_resized = self.draw_pose(frame_resized, keypoints, color)
+    def detect_frame(self):
+        if not self.stream:
+            return None, None, None
 
-        detections = []
-        fall_detected_this_frame = False
+        timings = {}
+        mark = time.perf_counter()
+        frame = self.stream.read(timeout=1.0)
+        if frame is None:
+            return None, None, None
+        mark = lap(timings, 'read', mark)
+
+        frame_resized = cv2.resize(frame, (640, 360))
+        mark = lap(timings, 'resize', mark)
+
+        fall_confidence = self.fall_confidence
+        tracking_confidence = self.tracking_confidence
+
+        results, pose_results = self.run_models(frame_resized, tracking_confidence, timings)
+        mark = time.perf_counter()
+
+        detections, skeletons = postprocess(results, pose_results, self.model.names,
+                                            self.fall_classes, fall_confidence)
+        fall_detected_this_frame = bool(detections)
         saved_image_filename = None
 
-        for box_data in all_boxes:
-            x1, y1, x2, y2 = box_data['bbox']
-            conf = box_data['conf']
-            class_name = box_data['class_name']
-            track_id = box_data['track_id']
-            is_fall = box_data['is_fall']
-
-            if is_fall:
-                detections.append({
-                    'bbox': [x1, y1, x2, y2],
-                    'confidence': conf,
-                    'class': class_name,
-                    'track_id': track_id
-                })
-                fall_detected_this_frame = True
-
-                cv2.rectangle(frame_resized,
-                            (int(x1), int(y1)),
-                            (int(x2), int(y2)),
-                            (0, 0, 255), 2)
-
-                label = f"Fall Detected #{track_id}" if track_id else "Fall Detected"
-                cv2.putText(frame_resized, label,
-                          (int(x1), int(y1) - 8),
-                          cv2.FONT_HERSHEY_SIMPLEX,
-                          0.5, (0, 0, 255), 2)
+        draw_started = time.perf_counter()
+        for kp_array, kp_conf, is_fall_skeleton in skeletons:
+            color = (0, 0, 255) if is_fall_skeleton else (0, 255, 255)
+            frame_resized = self.draw_pose(frame_resized, kp_array, kp_conf, color)
+
+        for detection in detections:
+            x1, y1, x2, y2 = detection['bbox']
+            track_id = detection['track_id']
+            cv2.rectangle(frame_resized,
+                        (int(x1), int(y1)),
+                        (int(x2), int(y2)),
+                        (0, 0, 255), 2)
+
+            label = f"Fall Detected #{track_id}" if track_id else "Fall Detected"
+            cv2.putText(frame_resized, label,
+                      (int(x1), int(y1) - 8),
+                      cv2.FONT_HERSHEY_SIMPLEX,
+                      0.5, (0, 0, 255), 2)
+        draw_ms = (time.perf_counter() - draw_started) * 1000
 
         if fall_detected_this_frame:
             startup_elapsed = (datetime.now() - self.startup_time).total_seconds() if self.startup_time else 999
             if startup_elapsed < self.startup_cooldown:
                 print(f"Startup cooldown: {self.startup_cooldown - startup_elapsed:.0f}s remaining")
             elif not self.is_cooldown_active():
+                detected_at = time.time()
                 self.last_detection_time = datetime.now()
-                saved_image_filename = self.save_detection_image(frame_resized)
-                print(f"New fall detected! Image saved: {saved_image_filename}")
 
-                # Send SMS alert if enabled in settings
-                sms_enabled = get_setting('alert_sms_enabled', 'false') == 'true'
-                if sms_enabled:
-                    phone_number = get_setting('alert_phone_number', '')
-                    send_sms_alert(phone_number)
+                # Alerts are queued first and delivered in the background
+                if self.sms_enabled:
+                    alert_dispatcher.send_alert('sms', self.phone_number, detected_at, self.camera_id)
+                if self.email_enabled:
+                    alert_dispatcher.send_alert('email', self.email_address, detected_at, self.camera_id)
 
-                # Send email alert if enabled in settings
-                email_enabled = get_setting('alert_email_enabled', 'false') == 'true'
-                if email_enabled:
-                    email_address = get_setting('alert_email_address', '')
-                    send_email_alert(email_address)
+                saved_image_filename = self.save_detection_image(frame_resized)
+                print(f"New fall detected! Image saved: {saved_image_filename}")
 
             else:
-                cooldown_seconds = int(get_setting('cooldown_seconds', '30'))
-                time_remaining = cooldown_seconds - (datetime.now() - self.last_detection_time).total_seconds()
+                time_remaining = self.cooldown_seconds - (datetime.now() - self.last_detection_time).total_seconds()
                 print(f"Cooldown active: {time_remaining:.0f}s remaining")
 
+        mark = lap(timings, 'postprocess', mark)
+        timings['postprocess'] -= draw_ms
+        timings['draw'] = draw_ms
+
         encode_param = [cv2.IMWRITE_JPEG_QUALITY, 75]
         _, buffer = cv2.imencode('.jpg', frame_resized, encode_param)
-        frame_base64 = base64.b64encode(buffer).decode('utf-8')
+        frame_jpeg = buffer.tobytes()
+        lap(timings, 'encode', mark)
+        self.last_timings = timings
+        self.record_metrics(timings)
+
+        return frame_jpeg, detections, saved_image_filename
+
+    def record_metrics(self, timings):
+        camera = self.metrics_label
+        for stage, ms in timings.items():
+            STAGE_MS.observe(ms, camera=camera, stage=stage)
+        if 'pose' in timings:
+            INFERENCE_MS.observe(timings['pose'], model='pose')
+        if 'track' in timings:
+            INFERENCE_MS.observe(timings['track'], model='fall')
+        FRAMES_PROCESSED.inc(camera=camera)
+
+        # Smoothed rate of processed frames
+        now = time.monotonic()
+        if self.last_frame_at is not None and now > self.last_frame_at:
+            fps = 1.0 / (now - self.last_frame_at)
+            self.processing_fps = fps if self.processing_fps is None else 0.9 * self.processing_fps + 0.1 * fps
+        self.last_frame_at = now
+
+    def start(self):
+        """Start the background worker that keeps detecting while the camera is connected"""
+        if self.worker and self.worker.is_alive():
+            return
+        self.worker = threading.Thread(target=self._detection_loop, name=f"live-detection-{self.camera_id}", daemon=True)
+        self.worker.start()
+
+    def _detection_loop(self):
+        while self.is_running:
+            try:
+                frame_jpeg, detections, saved_image = self.detect_frame()
+            except Exception as e:
+                print(f"Detection error: {e}")
+                time.sleep(0.5)
+                continue
 
-        return frame_base64, detections, saved_image_filename
+            if frame_jpeg is None:
+                continue
+
+            if saved_image:
+                self.save_fall(detections, saved_image)
+
+            self.publish_result(frame_jpeg, detections)
+
+        # save_fall() opened a connection on this thread, which ends here
+        from database import close_connection
+        close_connection()
+
+    def save_fall(self, detections, saved_image):
+        from database import save_detection
+
+        for detection in detections:
+            if 'fall' in detection['class'].lower():
+                print(f"Saving fall with image: {saved_image}")
+                save_detection(
+                    detection_type='fall',
+                    confidence=detection['confidence'],
+                    camera_source=str(self.camera_id) if self.camera_id is not None else 'live',
+                    image_data=saved_image,
+                    notes=f"Bounding box: {detection['bbox']}"
+                )
+                print(f"Fall saved to database with image!")
+                break
+
+    def publish_result(self, frame_jpeg, detections):
+        with self.result_condition:
+            self.frame_id += 1
+            self.latest_result = {
+                "jpeg": frame_jpeg,
+                "detections": detections,
+                "frame_id": self.frame_id,
+                "timestamp": datetime.now().isoformat()
+            }
+            self.result_condition.notify_all()
+            self._wake_async_waiters()
+
+    def _wake_async_waiters(self):
+        """Set the events of waiting async clients from this thread; call with result_condition held"""
+        for loop, event in self.async_waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The client's event loop is already closed
+                pass
+
+    def get_stats(self):
+        stats = self.stream.get_stats() if self.stream else {}
+        stats["frames_processed"] = self.frame_id
+        stats["processing_fps"] = self.processing_fps
+        return stats
+
+    def get_latest_result(self):
+        """Return the most recently published frame and detections, or None before the first frame"""
+        with self.result_condition:
+            return self.latest_result
+
+    def wait_for_result(self, after_frame_id, timeout=1.0):
+        """Block until a result newer than after_frame_id is published, returns None on timeout or stop"""
+        with self.result_condition:
+            self.result_condition.wait_for(
+                lambda: self.frame_id > after_frame_id or not self.is_running,
+                timeout=timeout
+            )
+            if self.frame_id > after_frame_id and self.is_running:
+                return self.latest_result
+            return None
+
+    async def wait_for_result_async(self, after_frame_id, timeout=1.0):
+        """wait_for_result for the event loop: streaming clients wait on an
+        asyncio.Event instead of each holding a threadpool worker"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.result_condition:
+            if self.frame_id > after_frame_id or not self.is_running:
+                return self.latest_result if self.frame_id > after_frame_id and self.is_running else None
+            self.async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self.result_condition:
+                self.async_waiters.discard(waiter)
+        with self.result_condition:
+            if self.frame_id > after_frame_id and self.is_running:
+                return self.latest_result
+            return None
 
     def stop(self):
         self.is_running = False
-        if self.cap:
-            self.cap.release()
+        settings_cache.unsubscribe(self.on_setting_changed)
+        with self.result_condition:
+            self.result_condition.notify_all()
+            self._wake_async_waiters()
+        if self.worker and self.worker is not threading.current_thread():
+            self.worker.join(timeout=5)
+        self.worker = None
+        if self.stream:
+            self.stream.stop()
+            self.stream = None
             print("Camera released")
\ No newline at end of file
@@ -0,0 +1,198 @@
+import bisect
+import threading
+
+# Default histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def collect(self):
+        with self.lock:
+            return list(self.values.items())
+
+    def render(self):
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in self.collect()]
+
+    def summary(self):
+        return [{"labels": dict(key), "value": value} for key, value in self.collect()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[_label_key(labels)] = value
+
+
+class CallbackMetric(Counter):
+    """Counter or gauge whose values are read from the running objects at scrape time.
+
+    collect_fn returns a list of (labels dict, value). Nothing is recorded on
+    the hot path; queue depths and per-camera stats are simply looked up
+    when /metrics is requested.
+    """
+
+    def __init__(self, name, help_text, kind, collect_fn):
+        super().__init__(name, help_text)
+        self.kind = kind
+        self.collect_fn = collect_fn
+
+    def collect(self):
+        try:
+            return [(_label_key(labels), value) for labels, value in self.collect_fn() if value is not None]
+        except Exception as e:
+            print(f"Metric {self.name} failed to collect: {e}")
+            return []
+
+
+class Histogram:
+    """Fixed-bucket histogram; observing a value is one bisect and a few additions under a lock"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS_MS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), sum, count
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self):
+        with self.lock:
+            return [(key, list(counts), total, count) for key, (counts, total, count) in self.series.items()]
+
+    def quantile(self, counts, count, q):
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if count == 0:
+            return None
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def render(self):
+        lines = []
+        for key, counts, total, count in self.collect():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+    def summary(self):
+        return [{
+            "labels": dict(key),
+            "count": count,
+            "mean": total / count if count else None,
+            "p50": self.quantile(counts, count, 0.5),
+            "p95": self.quantile(counts, count, 0.95),
+            "p99": self.quantile(counts, count, 0.99),
+        } for key, counts, total, count in self.collect()]
+
+
+class MetricsRegistry:
+    """All metrics of the process, rendered for Prometheus or summarized as JSON.
+
+    Metrics are created where they are recorded (counter(), histogram() ...)
+    and return the existing instance when asked for the same name twice.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _register(self, name, factory):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = factory()
+            return metric
+
+    def counter(self, name, help_text):
+        return self._register(name, lambda: Counter(name, help_text))
+
+    def gauge(self, name, help_text):
+        return self._register(name, lambda: Gauge(name, help_text))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS_MS):
+        return self._register(name, lambda: Histogram(name, help_text, buckets))
+
+    def callback(self, name, help_text, collect_fn, kind="gauge"):
+        """Replaces any earlier callback of the same name, so re-registering is safe"""
+        metric = CallbackMetric(name, help_text, kind, collect_fn)
+        with self.lock:
+            self.metrics[name] = metric
+        return metric
+
+    def render_prometheus(self):
+        """Prometheus text exposition format 0.0.4"""
+        with self.lock:
+            metrics = sorted(self.metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        with self.lock:
+            metrics = sorted(self.metrics.values(), key=lambda m: m.name)
+        return {metric.name: {"type": metric.kind, "help": metric.help, "series": metric.summary()}
+                for metric in metrics}
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,222 @@
+import copy
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from inference_backends import load_model
+from inference_cache import file_fingerprint
+
+# Live frames are resized to this before inference, so warm-up uses the same shape
+WARMUP_SIZE = (640, 360)
+
+
+def clone_model(model):
+    """Shallow copy of a loaded YOLO model that shares its weights but gets its own predictor.
+
+    ByteTrack state lives on the predictor when tracking with persist=True, so
+    each camera needs its own predictor while the weights stay loaded once.
+    """
+    clone = copy.copy(model)
+    clone.predictor = None
+    clone.callbacks = {event: list(funcs) for event, funcs in model.callbacks.items()}
+    return clone
+
+
+def model_version(path, backend='pytorch'):
+    """Short content hash of a weights file, or its stem for model configs that aren't files.
+
+    Exported backends get a suffix since their boxes differ slightly from PyTorch's.
+    """
+    path = Path(path)
+    version = file_fingerprint(path) if path.is_file() else path.stem
+    return version if backend == 'pytorch' else f"{version}-{backend}"
+
+
+class LoadedModel:
+    def __init__(self, path, model, load_ms, warmup_ms, artifact=None, backend='pytorch', version=None):
+        self.path = str(path)
+        self.artifact = str(artifact or path)
+        self.backend = backend
+        self.model = model
+        self.version = version or model_version(path, backend)
+        self.load_ms = load_ms
+        self.warmup_ms = warmup_ms
+        self.loaded_at = time.time()
+
+    def to_dict(self):
+        return {
+            "path": self.path,
+            "backend": self.backend,
+            "artifact": self.artifact,
+            "version": self.version,
+            "classes": len(self.model.names),
+            "load_ms": round(self.load_ms, 1),
+            "warmup_ms": round(self.warmup_ms, 1) if self.warmup_ms is not None else None,
+            "loaded_at": self.loaded_at,
+        }
+
+
+class ModelRegistry:
+    """Loads each weights file once and shares it between live cameras and video jobs.
+
+    Models are registered under a name ('fall', 'pose'). get() returns the
+    shared model; callers that run inference wrap it in clone_model() so they
+    get their own predictor and tracker state while the weights stay shared.
+    swap() loads and warms up a new weights file next to the serving one,
+    then replaces it and tells subscribers so they pick up the new model.
+    Weights are run on the inference backend set in `backend` (see
+    inference_backends.py); set_backend() reloads every model on a new one,
+    and change_backend() does that on a background thread.
+    """
+
+    def __init__(self, warmup=True, backend='pytorch'):
+        self.warmup = warmup
+        self.backend = backend
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.swap_lock = threading.Lock()
+        self.listeners = []
+        # Last backend change requested through change_backend()
+        self.backend_change = None
+
+    def _load(self, path, backend=None, loaded=()):
+        backend = backend or self.backend
+        # Shared by content rather than path, so weights retrained in place are loaded again
+        version = model_version(path, backend)
+        shared = next((entry for entry in [*self.entries.values(), *loaded]
+                       if entry.version == version and entry.backend == backend), None)
+        if shared is not None:
+            return LoadedModel(path, shared.model, 0.0, shared.warmup_ms, shared.artifact, shared.backend, version)
+
+        # ultralytics is imported on the first load so the app starts without torch,
+        # and a backend's first load includes exporting the weights
+        started = time.perf_counter()
+        model, artifact, backend = load_model(path, backend)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        warmup_ms = None
+        if self.warmup:
+            started = time.perf_counter()
+            # The first inference builds the predictor and fuses layers, so pay for it here
+            dummy = np.zeros((WARMUP_SIZE[1], WARMUP_SIZE[0], 3), dtype=np.uint8)
+            clone_model(model).predict(dummy, verbose=False)
+            warmup_ms = (time.perf_counter() - started) * 1000
+
+        return LoadedModel(path, model, load_ms, warmup_ms, artifact, backend)
+
+    def load(self, name, path):
+        """Load and warm up a model under a name, returns the shared model"""
+        entry = self._load(path)
+        with self.lock:
+            self.entries[name] = entry
+        warmup = f", warm-up {entry.warmup_ms:.0f} ms" if entry.warmup_ms is not None else ""
+        print(f"✅ Model '{name}' loaded from {path} ({entry.backend}) in {entry.load_ms:.0f} ms{warmup}")
+        return entry.model
+
+    def get(self, name):
+        with self.lock:
+            entry = self.entries.get(name)
+        if entry is None:
+            raise KeyError(f"Model '{name}' is not loaded")
+        return entry.model
+
+    def path(self, name):
+        with self.lock:
+            return self.entries[name].path
+
+    def artifact(self, name):
+        """The file actually loaded, e.g. the ONNX export of the weights"""
+        with self.lock:
+            return self.entries[name].artifact
+
+    def version(self, name):
+        with self.lock:
+            return self.entries[name].version
+
+    def subscribe(self, callback):
+        """callback(name, model) is called after a model has been swapped"""
+        self.listeners.append(callback)
+
+    def swap(self, name, path):
+        """Replace a loaded model with a new weights file without a restart"""
+        if name not in self.entries:
+            raise KeyError(f"Model '{name}' is not loaded")
+
+        # One swap at a time; the old model keeps serving while the new one loads
+        with self.swap_lock:
+            entry = self._load(path)
+            with self.lock:
+                self.entries[name] = entry
+            print(f"🔄 Model '{name}' swapped to {path} ({entry.backend}, load {entry.load_ms:.0f} ms)")
+
+            self._notify(name, entry.model)
+        return entry.model
+
+    def _notify(self, name, model):
+        for callback in list(self.listeners):
+            try:
+                callback(name, model)
+            except Exception as e:
+                print(f"Model swap listener error: {e}")
+
+    def set_backend(self, backend):
+        """Reload every model on another inference backend, all or nothing.
+
+        Every model is exported and loaded next to the serving ones first.
+        Only when all of them loaded are they swapped in and `backend`
+        changed; if one fails the serving models stay and the error is raised.
+        """
+        with self.swap_lock:
+            if backend == self.backend:
+                return
+            with self.lock:
+                sources = [(name, entry.path) for name, entry in self.entries.items()]
+
+            loaded = {}
+            for name, path in sources:
+                loaded[name] = self._load(path, backend, loaded.values())
+
+            with self.lock:
+                self.entries.update(loaded)
+                self.backend = backend
+            print(f"🔄 Inference backend switched to {backend}")
+
+            for name, entry in loaded.items():
+                self._notify(name, entry.model)
+
+    def change_backend(self, backend, on_failure=None):
+        """set_backend() on a background thread, exports can take minutes.
+
+        Progress is kept in backend_change; on_failure(backend, error) is
+        called if the switch failed and the previous backend is still serving.
+        """
+        last = self.backend_change
+        if backend == self.backend and (last is None or last["status"] != "running"):
+            return
+        change = {"backend": backend, "status": "running", "error": None, "started_at": time.time()}
+        self.backend_change = change
+
+        def run():
+            try:
+                self.set_backend(backend)
+                change["status"] = "completed"
+            except Exception as e:
+                print(f"❌ Switching inference backend to {backend} failed: {e}")
+                change["status"] = "failed"
+                change["error"] = str(e)
+                if on_failure is not None:
+                    on_failure(backend, e)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get_backend_status(self):
+        return {"backend": self.backend, "last_change": self.backend_change}
+
+    def get_stats(self):
+        with self.lock:
+            return {name: entry.to_dict() for name, entry in self.entries.items()}
+
+
+model_registry = ModelRegistry()
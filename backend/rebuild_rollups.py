@@ -0,0 +1,7 @@
+from database import init_schema, rebuild_rollups
+
+# Recompute the analytics rollup table from the raw detections, e.g. after
+# restoring a backup or editing detections by hand.
+init_schema()
+rebuild_rollups()
+print('Done')
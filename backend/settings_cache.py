@@ -0,0 +1,90 @@
+import threading
+
+from database import get_all_settings, add_settings_listener
+
+
+class SettingsCache:
+    """In-memory copy of the settings table.
+
+    Loaded from SQLite once, then kept current by update_setting, which
+    notifies the cache after every successful write. Subscribers (the live
+    detectors) are told about each change so the frame loop never has to
+    touch the database. The version counter increases on every change and
+    lets clients check cheaply whether they need to re-fetch settings.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = None
+        self.version = 0
+        self.subscribers = []
+        add_settings_listener(self._on_setting_updated)
+
+    def load(self):
+        values = get_all_settings()
+        with self.lock:
+            self.values = values
+            self.version += 1
+
+    def _ensure_loaded(self):
+        if self.values is None:
+            self.load()
+
+    def get(self, key, default=None):
+        self._ensure_loaded()
+        return self.values.get(key, default)
+
+    def get_float(self, key, default=0.0):
+        value = self.get(key)
+        try:
+            return float(value) if value is not None else default
+        except ValueError:
+            return default
+
+    def get_int(self, key, default=0):
+        value = self.get(key)
+        try:
+            return int(float(value)) if value is not None else default
+        except ValueError:
+            return default
+
+    def get_bool(self, key, default=False):
+        value = self.get(key)
+        if value is None:
+            return default
+        return value == 'true'
+
+    def snapshot(self):
+        self._ensure_loaded()
+        with self.lock:
+            return dict(self.values)
+
+    def get_version(self):
+        self._ensure_loaded()
+        return self.version
+
+    def subscribe(self, callback):
+        """Call callback(key, value) whenever a setting changes"""
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    def _on_setting_updated(self, key, value):
+        with self.lock:
+            if self.values is not None:
+                self.values[key] = value
+            self.version += 1
+            subscribers = list(self.subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(key, value)
+            except Exception as e:
+                print(f"Settings subscriber failed: {e}")
+
+
+settings_cache = SettingsCache()
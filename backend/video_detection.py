@@ -0,0 +1,271 @@
+import csv
+import gzip
+from datetime import datetime
+
+from database import save_detections_batch
+from inference_cache import CACHE_CONFIDENCE, CachedDetections
+from model_registry import clone_model
+from video_pipeline import (build_sampler, open_video, open_writer, read_frames, result_from_boxes, result_rows,
+                            sampling_stride, stream_video, stream_video_sampled)
+from video_segments import default_workers, render_video, track_video_segments
+
+
+def probe_video(video_path):
+    """Returns (fps, total_frames) without decoding the video"""
+    cap, fps, _, total = open_video(video_path)
+    cap.release()
+    return fps, total
+
+
+class FallEventCollector:
+    """Collapses per-frame fall boxes into fall events.
+
+    Boxes with the same track id (or all untracked boxes) belong to one event
+    for as long as they keep appearing; a gap of more than max_gap frames
+    closes the event and the next box starts a new one.
+    """
+
+    def __init__(self, max_gap=15):
+        self.max_gap = max_gap
+        self.open_events = {}
+        self.events = []
+
+    def add(self, frame_index, track_id, confidence):
+        event = self.open_events.get(track_id)
+        if event is not None and frame_index - event['end_frame'] > self.max_gap:
+            self.events.append(self.open_events.pop(track_id))
+            event = None
+
+        if event is None:
+            event = {
+                'track_id': track_id,
+                'start_frame': frame_index,
+                'end_frame': frame_index,
+                'peak_confidence': confidence,
+                'confidence_sum': 0.0,
+                'boxes': 0,
+            }
+            self.open_events[track_id] = event
+
+        event['end_frame'] = frame_index
+        event['peak_confidence'] = max(event['peak_confidence'], confidence)
+        event['confidence_sum'] += confidence
+        event['boxes'] += 1
+
+    def finish(self):
+        """Close all open events, returns every event ordered by start frame"""
+        self.events.extend(self.open_events.values())
+        self.open_events = {}
+
+        events = []
+        for event in sorted(self.events, key=lambda e: (e['start_frame'], e['track_id'] or 0)):
+            boxes = event.pop('boxes')
+            event['mean_confidence'] = event.pop('confidence_sum') / boxes
+            event['frames'] = event['end_frame'] - event['start_frame'] + 1
+            events.append(event)
+        return events
+
+
+# Parallel processing only pays off when every worker gets a decent share
+MIN_FRAMES_PER_WORKER = 300
+
+
+def group_by_frame(rows):
+    """Turn (frame, ...) rows in frame order into (frame_index, rows) pairs"""
+    frame_rows = []
+    current = 0
+    for frame, *row in rows:
+        if frame != current and frame_rows:
+            yield current, frame_rows
+            frame_rows = []
+        current = frame
+        frame_rows.append(tuple(row))
+    if frame_rows:
+        yield current, frame_rows
+
+
+def serial_frame_rows(model, job, output_path, confidence):
+    """Track and write the video frame by frame, yields (frame_index, rows)"""
+    for i, r in stream_video(model, job.input_path, output_path, conf=confidence, track=True):
+        job.update_progress(i + 1)
+        yield i, result_rows(r)
+
+
+def sampled_frame_rows(model, job, output_path, confidence, should_analyse):
+    """Track only the sampled frames, yields (frame_index, rows) for those"""
+    for i, rows in stream_video_sampled(model, job.input_path, output_path, should_analyse,
+                                        conf=confidence, track=True):
+        job.update_progress(i + 1)
+        yield i, rows
+    # The frames after the last analysed one were written too
+    job.update_progress(job.total_frames or job.frames_done)
+
+
+def parallel_frame_rows(model, job, output_path, confidence, total, workers):
+    """Track the video in parallel segments, render it, then yield (frame_index, rows)"""
+    rows = track_video_segments(job.params['model_path'], job.input_path, total, confidence, workers,
+                                on_progress=job.update_progress)
+    render_video(job.input_path, output_path, rows, model.names)
+    yield from group_by_frame(rows)
+
+
+def tracked_frame_rows(job, output_path, confidence, detect):
+    """Track detect(frame_index, frame) results at the job's confidence and write the video.
+
+    detect returns untracked detections at CACHE_CONFIDENCE or above, fresh
+    from the model or rebuilt from the cache. Both are cut to the requested
+    confidence before tracking, the same boxes model.track() would see, so a
+    cache hit gets the same track ids as the run that filled the cache.
+    Yields (frame_index, rows).
+    """
+    # Imports torch, which the app itself doesn't need at startup
+    from inference_scheduler import apply_tracker, create_tracker
+
+    tracker = create_tracker()
+    cap, fps, size, _ = open_video(job.input_path)
+    writer = open_writer(output_path, fps, size)
+    try:
+        for i, frame in read_frames(cap):
+            result = detect(i, frame)
+            result = apply_tracker(tracker, result[result.boxes.conf >= confidence])
+            writer.write(result.plot())
+            job.update_progress(i + 1)
+            yield i, result_rows(result)
+    finally:
+        cap.release()
+        writer.release()
+
+
+def caching_frame_rows(model, job, output_path, confidence, cache_rows):
+    """Infer at CACHE_CONFIDENCE, collect the untracked boxes in cache_rows and track at confidence"""
+    def detect(i, frame):
+        result = model.predict(frame, conf=CACHE_CONFIDENCE, verbose=False)[0]
+        cache_rows.extend((i, class_id, conf, *bbox) for _, class_id, conf, *bbox in result_rows(result))
+        return result
+
+    return tracked_frame_rows(job, output_path, confidence, detect)
+
+
+def cached_frame_rows(cached, job, output_path, confidence, names):
+    """Answer a job from cached detections: track them at confidence and render the video"""
+    def detect(i, frame):
+        return result_from_boxes(frame, cached.frame_boxes(i), names)
+
+    return tracked_frame_rows(job, output_path, confidence, detect)
+
+
+def detect_video(model, job, output_dir, confidence, cache=None):
+    """Run fall detection on an uploaded video, reporting progress on the job.
+
+    With a cache, a video seen before with the same model is answered from
+    its cached detections, only tracking and rendering are redone. Serial
+    full-rate runs of new videos infer at CACHE_CONFIDENCE and store every
+    box before tracking, so later requests at any higher threshold are cache
+    hits too.
+    """
+    fps, total = probe_video(job.input_path)
+    job.update_progress(0, total)
+
+    job_output_dir = output_dir / job.id
+    job_output_dir.mkdir(parents=True, exist_ok=True)
+    output_filename = f"{job.input_path.stem}.avi"
+    frames_filename = f"{job.input_path.stem}_frames.csv.gz"
+
+    sampling = job.params.get('sampling', 'all')
+    stride = sampling_stride(sampling, fps, job.params.get('stride', 5), job.params.get('target_fps', 5))
+    workers = job.params.get('workers') or default_workers()
+    workers = min(workers, (total or 0) // MIN_FRAMES_PER_WORKER)
+
+    # Each job gets its own predictor and tracker so concurrent jobs don't interfere
+    video_model = clone_model(model)
+    output_path = job_output_dir / output_filename
+    content_hash = job.params.get('content_hash')
+    cached = cache.get(content_hash, confidence) if cache and content_hash else None
+    cache_rows = None
+    should_analyse = None
+
+    if cached is not None:
+        # Cached results are full rate, so sampling has nothing left to save
+        print(f"Inference cache hit for {content_hash}")
+        sampling, stride = 'all', 1
+        frame_rows = cached_frame_rows(cached, job, output_path, confidence, model.names)
+    else:
+        should_analyse = build_sampler(video_model, job.input_path, sampling, fps, stride, conf=confidence)
+
+        if should_analyse is not None:
+            print(f"Sampling mode '{sampling}', stride {stride}")
+            frame_rows = sampled_frame_rows(video_model, job, output_path, confidence, should_analyse)
+        elif job.params.get('parallel') and job.params.get('model_path') and workers > 1:
+            # Segments are tracked in worker processes, their boxes aren't cached
+            print(f"Processing {total} frames in parallel with {workers} workers")
+            frame_rows = parallel_frame_rows(model, job, output_path, confidence, total, workers)
+        elif cache and content_hash and confidence >= CACHE_CONFIDENCE:
+            cache_rows = []
+            frame_rows = caching_frame_rows(video_model, job, output_path, confidence, cache_rows)
+        else:
+            frame_rows = serial_frame_rows(video_model, job, output_path, confidence)
+
+    total_detections = 0
+    analysed_frames = 0
+    detections_by_frame = []
+    # Half a second without the fall box still counts as the same fall, and never less than the sampling gap
+    collector = FallEventCollector(max_gap=max(1, int(fps / 2), 2 * stride))
+
+    # Per-frame boxes go to a compressed sidecar instead of the database
+    with gzip.open(job_output_dir / frames_filename, "wt", newline="") as frames_file:
+        frames_writer = csv.writer(frames_file)
+        frames_writer.writerow(["frame", "track_id", "class", "confidence", "x1", "y1", "x2", "y2"])
+
+        for i, rows in frame_rows:
+            analysed_frames += 1
+            total_detections += len(rows)
+
+            for track_id, class_id, box_confidence, *bbox in rows:
+                detection_class = model.names[class_id]
+                frames_writer.writerow([i, track_id if track_id is not None else "", detection_class,
+                                        f"{box_confidence:.4f}", *(f"{v:.1f}" for v in bbox)])
+
+                # Only the first few are returned, the rest are counted
+                if len(detections_by_frame) < 10:
+                    detections_by_frame.append({
+                        "frame": i,
+                        "confidence": box_confidence,
+                        "class": detection_class,
+                        "bbox": bbox,
+                        "track_id": track_id
+                    })
+
+                if 'fall' in detection_class.lower():
+                    collector.add(i, track_id, box_confidence)
+
+    total_frames = job.frames_done
+    if cache_rows is not None:
+        cache.put(content_hash, CachedDetections.from_rows(cache_rows, total_frames, fps, CACHE_CONFIDENCE))
+    events = collector.finish()
+    save_detections_batch([{
+        'detection_type': 'fall',
+        'confidence': event['peak_confidence'],
+        'notes': (f"Video: {job.filename}, Frames: {event['start_frame']}-{event['end_frame']}, "
+                  f"Track: {event['track_id'] if event['track_id'] is not None else '-'}, "
+                  f"Mean confidence: {event['mean_confidence']:.2f}")
+    } for event in events], camera_source='upload')
+
+    print(f"Saved as: {output_filename}")
+    print(f"Processed: {total_detections} detections found, {len(events)} fall events saved to database")
+
+    return {
+        "success": True,
+        "file_id": job.id,
+        "filename": output_filename,
+        "frames_file": frames_filename,
+        "total_frames": total_frames,
+        "sampling": sampling,
+        "analysed_frames": analysed_frames if should_analyse is not None else total_frames,
+        "cache_hit": cached is not None,
+        "total_detections": total_detections,
+        "total_events": len(events),
+        "events": events,
+        "detections": detections_by_frame,
+        "output_video": str(job_output_dir / output_filename),
+        "timestamp": datetime.now().isoformat()
+    }
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from database import close_connection
+from metrics import metrics
+
+JOBS = metrics.counter('fall_video_jobs_total', 'Finished video jobs by outcome')
+JOB_SECONDS = metrics.histogram('fall_video_job_seconds', 'Wall time of finished video jobs',
+                                buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600))
+JOB_FPS = metrics.histogram('fall_video_job_fps', 'Frames per second of finished video jobs',
+                            buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500))
+VIDEO_FRAMES = metrics.counter('fall_video_frames_total', 'Frames of uploaded videos processed')
+
+
+class VideoJob:
+    """One uploaded video waiting for or going through analysis"""
+
+    def __init__(self, job_id, filename, input_path, params=None):
+        self.id = job_id
+        self.filename = filename
+        self.input_path = input_path
+        self.params = params or {}
+        self.status = "queued"
+        self.frames_done = 0
+        self.total_frames = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+
+    def update_progress(self, frames_done, total_frames=None):
+        self.frames_done = frames_done
+        if total_frames is not None:
+            self.total_frames = total_frames
+
+    def to_dict(self):
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0
+        fps = self.frames_done / elapsed if elapsed > 0 else None
+
+        eta_seconds = None
+        if self.status == "processing" and fps and self.total_frames:
+            eta_seconds = max(self.total_frames - self.frames_done, 0) / fps
+
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "frames_done": self.frames_done,
+            "total_frames": self.total_frames,
+            "progress": min(self.frames_done / self.total_frames, 1.0) if self.total_frames else None,
+            "fps": fps,
+            "eta_seconds": eta_seconds,
+            "elapsed_seconds": elapsed,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class VideoJobQueue:
+    """Runs uploaded video analysis in the background, at most max_concurrent jobs at a time.
+
+    Jobs wait in FIFO order and each running job gets its own thread. The cap
+    can be changed at runtime; it keeps offline analysis from taking all the
+    CPU/GPU time away from live cameras. Finished jobs are kept in memory so
+    their results can still be fetched, oldest dropped first.
+    """
+
+    def __init__(self, process, max_concurrent=1, keep_finished=100):
+        self.process = process
+        self.max_concurrent = max_concurrent
+        self.keep_finished = keep_finished
+        self.jobs = OrderedDict()
+        self.pending = deque()
+        self.active = 0
+        self.lock = threading.Lock()
+
+    def configure(self, max_concurrent):
+        with self.lock:
+            self.max_concurrent = max(1, max_concurrent)
+            self._dispatch()
+
+    def submit(self, job):
+        with self.lock:
+            self.jobs[job.id] = job
+            self.pending.append(job)
+            self._dispatch()
+        return job
+
+    def _dispatch(self):
+        """Start queued jobs while there is room, call with the lock held"""
+        while self.pending and self.active < self.max_concurrent:
+            job = self.pending.popleft()
+            self.active += 1
+            threading.Thread(target=self._run, args=(job,), name=f"video-job-{job.id}", daemon=True).start()
+
+    def _run(self, job):
+        job.status = "processing"
+        job.started_at = time.time()
+        print(f"Processing job {job.id}: {job.filename}")
+        try:
+            job.result = self.process(job)
+            job.status = "completed"
+            print(f"Job {job.id} completed in {time.time() - job.started_at:.1f}s")
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            print(f"Job {job.id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            elapsed = job.finished_at - job.started_at
+            JOBS.inc(status=job.status)
+            JOB_SECONDS.observe(elapsed)
+            VIDEO_FRAMES.inc(job.frames_done)
+            if job.frames_done and elapsed > 0:
+                JOB_FPS.observe(job.frames_done / elapsed)
+            # Each job runs on its own thread, so its database connection goes with it
+            close_connection()
+            with self.lock:
+                self.active -= 1
+                self._prune()
+                self._dispatch()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "active": self.active,
+                "queued": len(self.pending),
+            }
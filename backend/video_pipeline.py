@@ -0,0 +1,297 @@
+import cv2
+
+SAMPLING_MODES = ('all', 'stride', 'fps', 'dense')
+
+
+def open_video(video_path):
+    """Open a video file, returns (capture, fps, (width, height), total_frames)"""
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {video_path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    return cap, fps, size, total if total > 0 else None
+
+
+def read_frames(cap):
+    """Yield (frame_index, frame) one decoded frame at a time"""
+    index = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        yield index, frame
+        index += 1
+
+
+def open_writer(output_path, fps, size):
+    """MJPG/AVI writer, the same container Ultralytics uses for save=True"""
+    writer = cv2.VideoWriter(str(output_path), cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    if not writer.isOpened():
+        raise ValueError(f"Cannot write video: {output_path}")
+    return writer
+
+
+def result_arrays(result):
+    """Boxes of one result as NumPy (xyxy, confidences, class ids, track ids or None).
+
+    Boxes.data holds x1, y1, x2, y2, [track id,] confidence, class per row,
+    so this is one device-to-host copy instead of one per box and attribute.
+    """
+    boxes = result.boxes
+    data = boxes.data.cpu().numpy() if hasattr(boxes.data, 'cpu') else boxes.data
+    track_ids = data[:, 4].astype(int) if boxes.is_track else None
+    return data[:, :4], data[:, -2], data[:, -1].astype(int), track_ids
+
+
+def result_rows(result):
+    """Plain (track_id, class_id, confidence, x1, y1, x2, y2) tuples for the boxes of one result"""
+    if len(result.boxes) == 0:
+        return []
+    xyxy, confidences, class_ids, track_ids = result_arrays(result)
+    track_ids = track_ids.tolist() if track_ids is not None else [None] * len(class_ids)
+    return [(track_id, class_id, conf, *bbox)
+            for track_id, class_id, conf, bbox in zip(track_ids, class_ids.tolist(), confidences.tolist(), xyxy.tolist())]
+
+
+def box_iou(a, b):
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def draw_boxes(frame, rows, names):
+    """Draw (track_id, class_id, confidence, x1, y1, x2, y2) rows on a frame in place"""
+    for track_id, class_id, confidence, x1, y1, x2, y2 in rows:
+        color = (0, 0, 255) if 'fall' in names[class_id].lower() else (0, 200, 0)
+        label = f"#{track_id} {names[class_id]} {confidence:.2f}" if track_id else f"{names[class_id]} {confidence:.2f}"
+        cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 2)
+        cv2.putText(frame, label, (int(x1), max(int(y1) - 6, 12)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+    return frame
+
+
+def interpolate_rows(before, after, t, min_iou=0.3):
+    """Boxes at fraction t (0..1) of the way between two analysed frames.
+
+    Boxes are paired by track id, or by class and overlap when untracked, and
+    their corners interpolated linearly. A box seen on only one side is held
+    for the half of the gap closest to it.
+    """
+    rows = []
+    unmatched = list(after)
+    for row in before:
+        match = None
+        for candidate in unmatched:
+            if row[0] is not None and candidate[0] == row[0]:
+                match = candidate
+                break
+        if match is None:
+            best = min_iou
+            for candidate in unmatched:
+                if candidate[1] == row[1] and (row[0] is None or candidate[0] is None):
+                    iou = box_iou(row[3:], candidate[3:])
+                    if iou >= best:
+                        best, match = iou, candidate
+
+        if match is None:
+            if t < 0.5:
+                rows.append(row)
+            continue
+        unmatched.remove(match)
+        confidence = row[2] + (match[2] - row[2]) * t
+        box = [a + (b - a) * t for a, b in zip(row[3:], match[3:])]
+        rows.append((row[0], row[1], confidence, *box))
+
+    if t >= 0.5:
+        rows.extend(unmatched)
+    return rows
+
+
+def sampling_stride(mode, fps, stride=5, target_fps=5):
+    """Frames between analysed frames for a sampling mode"""
+    if mode == 'fps':
+        return max(1, round(fps / max(target_fps, 0.1)))
+    if mode in ('stride', 'dense'):
+        return max(1, int(stride))
+    return 1
+
+
+def result_from_boxes(frame, boxes, names):
+    """Rebuild an untracked Results from an (N, 6) array of x1, y1, x2, y2, confidence, class"""
+    import torch
+    from ultralytics.engine.results import Results
+
+    return Results(frame, path="", names=names, boxes=torch.as_tensor(boxes))
+
+
+def find_candidate_frames(model, video_path, stride, conf):
+    """Sparse pass for dense sampling, returns (frames that contain a fall box, boxes by analysed frame).
+
+    The boxes are kept as (N, 6) arrays so the tracking pass can reuse them
+    instead of inferring the stride frames a second time.
+    """
+    cap, _, _, _ = open_video(video_path)
+    candidates = []
+    detections = {}
+    index = 0
+    try:
+        while True:
+            # grab() skips converting frames that won't be analysed
+            if index % stride == 0:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                result = model.predict(frame, conf=conf, verbose=False)[0]
+                boxes = result.boxes.data.cpu().numpy()
+                detections[index] = boxes
+                if any('fall' in model.names[cls].lower() for cls in boxes[:, -1].astype(int).tolist()):
+                    candidates.append(index)
+            elif not cap.grab():
+                break
+            index += 1
+    finally:
+        cap.release()
+    return candidates, detections
+
+
+class DenseSampler:
+    """should_analyse for dense sampling: every Nth frame plus every frame in a window.
+
+    Holds the sparse pass's boxes for the stride frames; detections(index)
+    returns them so those frames aren't inferred again.
+    """
+
+    def __init__(self, step, windows, detections):
+        self.step = step
+        self.windows = windows
+        self.boxes = detections
+
+    def __call__(self, index):
+        if index % self.step == 0:
+            return True
+        return any(start <= index <= end for start, end in self.windows)
+
+    def detections(self, index):
+        return self.boxes.get(index)
+
+
+def build_sampler(model, video_path, mode, fps, stride=5, target_fps=5, conf=0.5, window_seconds=1.0):
+    """Returns should_analyse(frame_index), or None when every frame is analysed.
+
+    stride and fps analyse every Nth frame. dense first runs a sparse pass
+    at the stride, then analyses every frame within window_seconds (plus one
+    stride) of a candidate fall and every Nth frame elsewhere. The sparse
+    pass's boxes are reused for the stride frames, so the tracking pass
+    only infers the window frames in between.
+    """
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode: {mode}")
+
+    step = sampling_stride(mode, fps, stride, target_fps)
+    if step == 1:
+        return None
+    if mode != 'dense':
+        return lambda index: index % step == 0
+
+    candidates, detections = find_candidate_frames(model, video_path, step, conf)
+    pad = step + int(fps * window_seconds)
+    windows = []
+    for frame in candidates:
+        if windows and frame - pad <= windows[-1][1]:
+            windows[-1][1] = frame + pad
+        else:
+            windows.append([frame - pad, frame + pad])
+    print(f"Dense sampling: {len(candidates)} candidate frames in {len(windows)} windows")
+    return DenseSampler(step, windows, detections)
+
+
+def stream_video_sampled(model, video_path, output_path, should_analyse, conf=0.5, track=False):
+    """Like stream_video, but only frames where should_analyse(index) is true are inferred.
+
+    Yields (frame_index, rows) for analysed frames. Every frame is still
+    written; skipped frames are held back until the next analysed frame and
+    drawn with boxes interpolated between the two results, so memory is
+    bounded by the gap between analysed frames. Frames a DenseSampler
+    already has boxes for are tracked from those instead of inferred again.
+    """
+    # Imports torch, which the app itself doesn't need at startup
+    from inference_scheduler import apply_tracker, create_tracker
+
+    cap, fps, size, _ = open_video(video_path)
+    writer = open_writer(output_path, fps, size) if output_path else None
+    names = model.names
+    detections = getattr(should_analyse, 'detections', lambda index: None)
+    # Tracked here rather than with model.track() so reused boxes go through the same tracker
+    tracker = create_tracker() if track else None
+    previous = None
+    pending = []
+
+    try:
+        for index, frame in read_frames(cap):
+            if not should_analyse(index):
+                if writer is not None:
+                    if previous is None:
+                        writer.write(frame)
+                    else:
+                        pending.append((index, frame))
+                continue
+
+            boxes = detections(index)
+            if boxes is not None:
+                result = result_from_boxes(frame, boxes, names)
+            else:
+                result = model.predict(frame, conf=conf, verbose=False)[0]
+            if tracker is not None:
+                result = apply_tracker(tracker, result)
+            rows = result_rows(result)
+
+            if writer is not None:
+                for skipped_index, skipped_frame in pending:
+                    t = (skipped_index - previous[0]) / (index - previous[0])
+                    writer.write(draw_boxes(skipped_frame, interpolate_rows(previous[1], rows, t), names))
+                pending = []
+                writer.write(draw_boxes(frame, rows, names))
+
+            previous = (index, rows)
+            yield index, rows
+
+        # Frames after the last analysed one keep its boxes
+        for _, skipped_frame in pending:
+            writer.write(draw_boxes(skipped_frame, previous[1], names))
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+
+
+def stream_video(model, video_path, output_path=None, conf=0.5, track=False, **predict_args):
+    """Decode, infer, annotate and write a video one frame at a time.
+
+    Yields (frame_index, result) after each frame has been written. Only the
+    current frame and its Results are alive at any point, so memory use does
+    not depend on the length of the video. Callers should copy what they
+    need out of each result rather than keep it. With track=True boxes get
+    ByteTrack ids that persist across frames.
+    """
+    cap, fps, size, _ = open_video(video_path)
+    writer = open_writer(output_path, fps, size) if output_path else None
+
+    try:
+        for index, frame in read_frames(cap):
+            if track:
+                result = model.track(frame, conf=conf, persist=True, tracker="bytetrack.yaml",
+                                     verbose=False, **predict_args)[0]
+            else:
+                result = model.predict(frame, conf=conf, verbose=False, **predict_args)[0]
+            if writer is not None:
+                writer.write(result.plot())
+            yield index, result
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
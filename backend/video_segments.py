@@ -0,0 +1,157 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from video_pipeline import box_iou, draw_boxes, open_video, open_writer, read_frames, result_rows
+
+_worker_model = None
+
+
+def _init_worker(model_path, threads):
+    """Runs once per worker process: limit torch threads and load the weights"""
+    global _worker_model
+    import torch
+    from ultralytics import YOLO
+
+    torch.set_num_threads(threads)
+    _worker_model = YOLO(model_path)
+
+
+def _reset_tracker(model):
+    predictor = model.predictor
+    if predictor is not None:
+        for tracker in getattr(predictor, "trackers", []):
+            tracker.reset()
+
+
+def _process_segment(video_path, index, warmup_start, start, end, conf):
+    """Track frames [warmup_start, end), returns (index, rows, frames in the segment)"""
+    _reset_tracker(_worker_model)
+
+    cap = cv2.VideoCapture(str(video_path))
+    # OpenCV seeks to the preceding keyframe and decodes forward to the exact frame
+    cap.set(cv2.CAP_PROP_POS_FRAMES, warmup_start)
+
+    rows = []
+    try:
+        for offset, frame in read_frames(cap):
+            frame_index = warmup_start + offset
+            if frame_index >= end:
+                break
+            result = _worker_model.track(frame, conf=conf, persist=True, tracker="bytetrack.yaml", verbose=False)[0]
+            rows.extend((frame_index, *row) for row in result_rows(result))
+    finally:
+        cap.release()
+
+    return index, rows, end - start
+
+
+def plan_segments(total_frames, segments, overlap):
+    """Split [0, total_frames) into (warmup_start, start, end) ranges"""
+    size = -(-total_frames // segments)
+    plan = []
+    for start in range(0, total_frames, size):
+        end = min(start + size, total_frames)
+        plan.append((max(0, start - overlap), start, end))
+    return plan
+
+
+def stitch_tracks(segments, overlap, min_iou=0.5):
+    """Give tracks global ids across segments.
+
+    segments is a list of (start, end, rows) in frame order where rows are
+    (frame, track_id, class_id, confidence, x1, y1, x2, y2) and rows before
+    start are warm-up frames. A local track inherits the global id of the
+    previous segment's track it overlaps most on the shared frames; other
+    tracks get new ids. Returns the rows of all segments without warm-up
+    frames, with global ids.
+    """
+    next_id = 1
+    merged = []
+    previous_tail = {}
+
+    for start, end, rows in segments:
+        votes = {}
+        for frame, track_id, _, _, *box in rows:
+            if frame >= start or track_id is None:
+                continue
+            for global_id, global_box in previous_tail.get(frame, []):
+                iou = box_iou(box, global_box)
+                if iou >= min_iou:
+                    votes[(track_id, global_id)] = votes.get((track_id, global_id), 0) + iou
+
+        mapping = {}
+        claimed = set()
+        for (track_id, global_id), _ in sorted(votes.items(), key=lambda item: -item[1]):
+            if track_id not in mapping and global_id not in claimed:
+                mapping[track_id] = global_id
+                claimed.add(global_id)
+
+        previous_tail = {}
+        for frame, track_id, *rest in rows:
+            if frame < start:
+                continue
+            if track_id is not None:
+                if track_id not in mapping:
+                    mapping[track_id] = next_id
+                    next_id += 1
+                track_id = mapping[track_id]
+                if frame >= end - overlap:
+                    previous_tail.setdefault(frame, []).append((track_id, rest[2:]))
+            merged.append((frame, track_id, *rest))
+
+    return merged
+
+
+def render_video(video_path, output_path, rows, names):
+    """Draw the (stitched) boxes on the original frames and write the output video"""
+    boxes_by_frame = {}
+    for frame, track_id, class_id, confidence, *box in rows:
+        boxes_by_frame.setdefault(frame, []).append((track_id, class_id, confidence, *box))
+
+    cap, fps, size, _ = open_video(video_path)
+    writer = open_writer(output_path, fps, size)
+    try:
+        for index, frame in read_frames(cap):
+            draw_boxes(frame, boxes_by_frame.get(index, []), names)
+            writer.write(frame)
+    finally:
+        cap.release()
+        writer.release()
+
+
+def default_workers():
+    return max(1, os.cpu_count() or 1)
+
+
+def track_video_segments(model_path, video_path, total_frames, conf, workers, overlap=15,
+                         segments_per_worker=4, on_progress=None):
+    """Track a video in parallel segments, returns rows with stitched track ids in frame order.
+
+    The video is cut into contiguous frame ranges that are tracked in a
+    process pool, one YOLO model per worker process. Every segment after the
+    first starts `overlap` frames early; those warm-up frames give the
+    tracker history and let ids be stitched to the previous segment. More
+    segments than workers are scheduled so progress is reported often and a
+    slow segment doesn't leave the other workers idle at the end.
+    """
+    plan = plan_segments(total_frames, workers * segments_per_worker, overlap)
+    threads = max(1, (os.cpu_count() or workers) // workers)
+    results = [None] * len(plan)
+    frames_done = 0
+
+    # spawn: forking a process that already runs torch threads can deadlock
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(str(model_path), threads)) as pool:
+        futures = [pool.submit(_process_segment, str(video_path), index, warmup_start, start, end, conf)
+                   for index, (warmup_start, start, end) in enumerate(plan)]
+        for future in as_completed(futures):
+            index, rows, frames = future.result()
+            results[index] = rows
+            frames_done += frames
+            if on_progress:
+                on_progress(frames_done)
+
+    return stitch_tracks([(start, end, rows) for (_, start, end), rows in zip(plan, results)], overlap)
@@ -12,6 +12,7 @@ function Dashboard() {
   const [fallsByHour, setFallsByHour] = useState([]);
   const [confidenceDist, setConfidenceDist] = useState([]);
   const [recentDetections, setRecentDetections] = useState([]);
+  const [pipeline, setPipeline] = useState(null);
   const [loading, setLoading] = useState(true);
 
   const today = new Date().toISOString().slice(0, 10);
@@ -28,35 +29,34 @@ function Dashboard() {
     fetchAll();
   }, []);
 
-  const fetchAll = async () => {
-    setLoading(true);
+  // Periodic refresh; the browser revalidates with the ETag so unchanged data comes back as 304
+  useEffect(() => {
+    const interval = setInterval(() => fetchAll(false), 30000);
+    return () => clearInterval(interval);
+  }, [dateFrom, dateTo]);
+
+  const fetchAll = async (showLoading = true) => {
+    if (showLoading) setLoading(true);
     try {
-      const diffDays = Math.ceil(
-        (new Date(dateTo) - new Date(dateFrom)) / (1000 * 60 * 60 * 24)
-      ) + 1;
-
-      const [summaryRes, perDayRes, byHourRes, confRes, recentRes] = await Promise.all([
-        api.getAnalyticsSummary(),
-        api.getFallsPerDay(diffDays),
-        api.getFallsByHour(),
-        api.getConfidenceDistribution(),
-        api.getRecentDetections(5),
-      ]);
-
-      setSummary(summaryRes);
-
-      const filtered = perDayRes.data.filter(d => d.day >= dateFrom && d.day <= dateTo);
-      setFallsPerDay(filtered.map(d => ({ day: d.day.slice(5), count: d.count })));
-      setFallsByHour(byHourRes.data.map(d => ({
+      const data = await api.getDashboard(dateFrom, dateTo, 5);
+
+      setSummary(data.summary);
+      setFallsPerDay(data.falls_per_day.map(d => ({ day: d.day.slice(5), count: d.count })));
+      setFallsByHour(data.falls_by_hour.map(d => ({
         hour: String(d.hour).padStart(2, '0') + ':00',
         count: d.count,
       })));
-      setConfidenceDist(confRes.data);
-      setRecentDetections(recentRes.data);
+      setConfidenceDist(data.confidence_distribution);
+      setRecentDetections(data.recent);
     } catch (error) {
       console.error('Failed to fetch dashboard data:', error);
     }
-    setLoading(false);
+    try {
+      setPipeline(await api.getMetricsSummary());
+    } catch (error) {
+      console.error('Failed to fetch pipeline metrics:', error);
+    }
+    if (showLoading) setLoading(false);
   };
 
   const handleExportPDF = () => {
@@ -87,6 +87,39 @@ function Dashboard() {
     { icon: Clock, label: 'Last Fall', value: formatLastFall(summary.last_fall), color: '#2ecc71', sub: summary.last_fall ? new Date(summary.last_fall).toLocaleDateString() : '-', small: true },
   ] : [];
 
+  // Value of a metric series matching all given labels
+  const metricSeries = (name, labels = {}) => {
+    const metric = pipeline && pipeline[name];
+    if (!metric) return null;
+    return metric.series.find(s => Object.entries(labels).every(([k, v]) => s.labels[k] === v)) || null;
+  };
+
+  // Series with the highest p95, e.g. the slowest alert channel
+  const slowest = (name) => {
+    const series = pipeline && pipeline[name] ? pipeline[name].series : [];
+    return series.reduce((worst, s) => (!worst || s.p95 > worst.p95 ? s : worst), null);
+  };
+
+  const formatMs = (series) => series && series.p95 != null ? series.p95.toFixed(0) + ' ms' : '-';
+
+  const cameraHealth = pipeline && pipeline.fall_camera_processing_fps
+    ? pipeline.fall_camera_processing_fps.series.map(s => ({
+        camera: s.labels.camera,
+        fps: s.value,
+        dropped: (metricSeries('fall_camera_frames_dropped_total', { camera: s.labels.camera }) || {}).value || 0,
+        capture: formatMs(metricSeries('fall_capture_read_ms', { camera: s.labels.camera })),
+      }))
+    : [];
+
+  const healthStats = [
+    { label: 'Fall model p95', value: formatMs(metricSeries('fall_inference_ms', { model: 'fall' })) },
+    { label: 'Pose model p95', value: formatMs(metricSeries('fall_inference_ms', { model: 'pose' })) },
+    { label: 'DB write p95', value: formatMs(metricSeries('fall_db_write_ms')) },
+    { label: 'Alert hand-off p95', value: formatMs(slowest('fall_alert_handoff_ms')) },
+    { label: 'Alerts queued', value: pipeline && pipeline.fall_alert_queue_depth ? pipeline.fall_alert_queue_depth.series.reduce((sum, s) => sum + s.value, 0) : '-' },
+    { label: 'Video jobs queued', value: (metricSeries('fall_video_jobs', { state: 'queued' }) || {}).value ?? '-' },
+  ];
+
   if (loading) {
     return (
       <div style={{ display: 'flex', alignItems: 'center', justifyContent: 'center', height: '400px' }}>
@@ -114,7 +147,7 @@ function Dashboard() {
         <input type="date" value={dateFrom} onChange={(e) => setDateFrom(e.target.value)} style={styles.dateInput} />
         <span style={styles.filterLabel}>to</span>
         <input type="date" value={dateTo} onChange={(e) => setDateTo(e.target.value)} style={styles.dateInput} />
-        <button style={styles.applyBtn} onClick={fetchAll}>Apply</button>
+        <button style={styles.applyBtn} onClick={() => fetchAll()}>Apply</button>
       </div>
 
       <div style={styles.statsGrid}>
@@ -188,6 +221,30 @@ function Dashboard() {
         )}
       </div>
 
+      {pipeline && (
+        <div style={{ ...styles.chartCard, marginBottom: '24px' }}>
+          <h3 style={styles.chartTitle}>Pipeline Health</h3>
+          <p style={styles.chartSub}>Since the server started — full metrics at /metrics</p>
+          <div style={styles.healthGrid}>
+            {healthStats.map((stat) => (
+              <div key={stat.label} style={styles.healthItem}>
+                <p style={styles.statLabel}>{stat.label}</p>
+                <p style={styles.healthValue}>{stat.value}</p>
+              </div>
+            ))}
+          </div>
+          {cameraHealth.length === 0 ? (
+            <p style={styles.statSub}>No cameras running</p>
+          ) : (
+            cameraHealth.map((cam) => (
+              <p key={cam.camera} style={styles.activityText}>
+                Camera <strong>{cam.camera}</strong>: {cam.fps.toFixed(1)} FPS, {cam.dropped} frames dropped, capture p95 {cam.capture}
+              </p>
+            ))
+          )}
+        </div>
+      )}
+
       <div style={styles.activityCard}>
         <h3 style={styles.activityTitle}>Recent Fall Detections</h3>
         {recentDetections.length === 0 ? (
@@ -234,6 +291,9 @@ const styles = {
   chartTitle: { fontSize: '16px', fontWeight: '600', color: '#2c3e50', margin: '0 0 4px 0' },
   chartSub: { fontSize: '12px', color: '#95a5a6', margin: '0 0 20px 0' },
   emptyChart: { height: '220px', display: 'flex', alignItems: 'center', justifyContent: 'center', color: '#bdc3c7', fontSize: '14px', backgroundColor: '#f8f9fa', borderRadius: '8px' },
+  healthGrid: { display: 'grid', gridTemplateColumns: 'repeat(6, 1fr)', gap: '16px', marginBottom: '16px' },
+  healthItem: { backgroundColor: '#f8f9fa', padding: '12px', borderRadius: '8px' },
+  healthValue: { fontSize: '18px', fontWeight: '700', color: '#2c3e50', margin: 0 },
   activityCard: { backgroundColor: '#ffffff', padding: '24px', borderRadius: '12px', boxShadow: '0 2px 8px rgba(0,0,0,0.08)', marginBottom: '24px' },
   activityTitle: { fontSize: '16px', fontWeight: '600', color: '#2c3e50', marginTop: 0, marginBottom: '20px' },
   activityList: { display: 'flex', flexDirection: 'column', gap: '16px', maxHeight: '250px', overflowY: 'auto' },
@@ -80,11 +80,11 @@ const toastStyles = {
 
 function LiveDetection() {
   const [isRunning, setIsRunning] = useState(false);
-  const [currentFrame, setCurrentFrame] = useState(null);
+  const [streamUrl, setStreamUrl] = useState(null);
   const [detections, setDetections] = useState([]);
   const [fallCount, setFallCount] = useState(0);
   const [loading, setLoading] = useState(false);
-  const intervalRef = useRef(null);
+  const eventSourceRef = useRef(null);
   const activeFallIds = useRef(new Set());
   const navigate = useNavigate();
   const { addNotification, activeToast, dismissToast } = useNotifications();
@@ -95,7 +95,7 @@ function LiveDetection() {
       const response = await api.startLiveDetection();
       if (response.status === 'success' || response.status === 'already_running') {
         setIsRunning(true);
-        startFramePolling();
+        startStream();
       } else {
         alert('Failed to start camera: ' + response.message);
       }
@@ -109,54 +109,51 @@ function LiveDetection() {
     try {
       await api.stopLiveDetection();
       setIsRunning(false);
-      stopFramePolling();
+      stopStream();
     } catch (error) {
       alert('Error: ' + error.message);
     }
   };
 
-  const startFramePolling = () => {
-    intervalRef.current = setInterval(async () => {
-      try {
-        const data = await api.getLiveFrame();
-        setCurrentFrame(data.frame);
-        setDetections(data.detections || []);
+  const startStream = () => {
+    setStreamUrl(api.getLiveStreamUrl());
 
-        const falls = data.detections.filter(d => d.class?.toLowerCase().includes('fall'));
-        falls.forEach(fall => {
-          const id = fall.track_id ?? 'unknown';
-          if (!activeFallIds.current.has(id)) {
-            activeFallIds.current.add(id);
-            setFallCount(prev => prev + 1);
-            addNotification(id, fall.confidence);
-            playAlertSound();
-          }
-        });
-      } catch (error) {
-        console.error('Frame error:', error);
-      }
-    }, 120);
+    const eventSource = new EventSource(api.getLiveEventsUrl());
+    eventSource.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      const frameDetections = data.detections || [];
+      setDetections(frameDetections);
+
+      const falls = frameDetections.filter(d => d.class?.toLowerCase().includes('fall'));
+      falls.forEach(fall => {
+        const id = fall.track_id ?? 'unknown';
+        if (!activeFallIds.current.has(id)) {
+          activeFallIds.current.add(id);
+          setFallCount(prev => prev + 1);
+          addNotification(id, fall.confidence);
+          playAlertSound();
+        }
+      });
+    };
+    eventSource.onerror = (error) => {
+      console.error('Detection stream error:', error);
+    };
+    eventSourceRef.current = eventSource;
   };
 
-  const stopFramePolling = () => {
-    if (intervalRef.current) {
-      clearInterval(intervalRef.current);
-      intervalRef.current = null;
+  const stopStream = () => {
+    if (eventSourceRef.current) {
+      eventSourceRef.current.close();
+      eventSourceRef.current = null;
     }
     setDetections([]);
-    setCurrentFrame(null);
+    setStreamUrl(null);
     setFallCount(0);
     activeFallIds.current = new Set();
   };
 
   useEffect(() => {
-    return () => stopFramePolling();
-  }, []);
-
-  useEffect(() => {
-    const handleBeforeUnload = () => api.stopLiveDetection();
-    window.addEventListener('beforeunload', handleBeforeUnload);
-    return () => window.removeEventListener('beforeunload', handleBeforeUnload);
+    return () => stopStream();
   }, []);
 
   return (
@@ -219,9 +216,9 @@ function LiveDetection() {
         </div>
 
         <div style={styles.videoContainer}>
-          {currentFrame && isRunning ? (
+          {streamUrl && isRunning ? (
             <img
-              src={`data:image/jpeg;base64,${currentFrame}`}
+              src={streamUrl}
               alt="Live feed"
               style={styles.video}
             />
@@ -1,21 +1,68 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { api } from '../services/api';
 
 function VideoUpload() {
   const [selectedFile, setSelectedFile] = useState(null);
   const [uploading, setUploading] = useState(false);
   const [results, setResults] = useState(null);
+  const [job, setJob] = useState(null);
+  const [parallel, setParallel] = useState(false);
+  const [sampling, setSampling] = useState('all');
+  const [stride, setStride] = useState(5);
+  const [targetFps, setTargetFps] = useState(5);
+  const pollRef = useRef(null);
+
+  useEffect(() => {
+    return () => clearInterval(pollRef.current);
+  }, []);
+
+  const pollJob = (jobId) => {
+    clearInterval(pollRef.current);
+    pollRef.current = setInterval(async () => {
+      try {
+        const status = await api.getJob(jobId);
+        setJob(status);
+        if (status.status === 'completed') {
+          clearInterval(pollRef.current);
+          setResults(status.result);
+          setUploading(false);
+        } else if (status.status === 'failed') {
+          clearInterval(pollRef.current);
+          alert('Error: ' + status.error);
+          setUploading(false);
+        }
+      } catch (err) {
+        clearInterval(pollRef.current);
+        alert('Error: ' + err.message);
+        setUploading(false);
+      }
+    }, 1000);
+  };
 
   const handleUpload = async () => {
     if (!selectedFile) return;
     setUploading(true);
+    setResults(null);
+    setJob(null);
     try {
-      const result = await api.detectVideo(selectedFile);
-      setResults(result);
+      const queued = await api.detectVideo(selectedFile, {
+        parallel,
+        sampling,
+        stride,
+        target_fps: targetFps,
+      });
+      setJob(queued);
+      pollJob(queued.job_id);
     } catch (err) {
       alert('Error: ' + err.message);
+      setUploading(false);
     }
-    setUploading(false);
+  };
+
+  const formatEta = (seconds) => {
+    if (seconds == null) return '-';
+    if (seconds < 60) return Math.ceil(seconds) + 's';
+    return Math.floor(seconds / 60) + 'm ' + Math.ceil(seconds % 60) + 's';
   };
 
   return (
@@ -42,6 +89,41 @@ function VideoUpload() {
           </div>
         )}
         
+        <div style={styles.optionRow}>
+          <label style={styles.optionLabel}>
+            Frames to analyse
+            <select value={sampling} onChange={(e) => setSampling(e.target.value)} disabled={uploading} style={styles.optionInput}>
+              <option value="all">Every frame</option>
+              <option value="stride">Every Nth frame</option>
+              <option value="fps">Target analysis FPS</option>
+              <option value="dense">Dense around candidate falls</option>
+            </select>
+          </label>
+          {(sampling === 'stride' || sampling === 'dense') && (
+            <label style={styles.optionLabel}>
+              Every
+              <input type="number" min="1" value={stride} onChange={(e) => setStride(Number(e.target.value))} disabled={uploading} style={styles.optionInput} />
+              frames
+            </label>
+          )}
+          {sampling === 'fps' && (
+            <label style={styles.optionLabel}>
+              <input type="number" min="0.5" step="0.5" value={targetFps} onChange={(e) => setTargetFps(Number(e.target.value))} disabled={uploading} style={styles.optionInput} />
+              FPS
+            </label>
+          )}
+        </div>
+
+        <label style={styles.optionLabel}>
+          <input
+            type="checkbox"
+            checked={parallel}
+            onChange={(e) => setParallel(e.target.checked)}
+            disabled={uploading || sampling !== 'all'}
+          />
+          Parallel processing (faster for long recordings)
+        </label>
+
         <button 
           onClick={handleUpload} 
           disabled={!selectedFile || uploading}
@@ -53,6 +135,20 @@ function VideoUpload() {
         >
           {uploading ? '⏳ Processing...' : '🚀 Detect Falls'}
         </button>
+
+        {uploading && job && (
+          <div style={styles.progressBox}>
+            <div style={styles.progressTrack}>
+              <div style={{ ...styles.progressFill, width: `${Math.round((job.progress || 0) * 100)}%` }} />
+            </div>
+            <p style={styles.progressText}>
+              {job.status === 'queued'
+                ? 'Waiting in queue...'
+                : `${job.frames_done}${job.total_frames ? ' / ' + job.total_frames : ''} frames`
+                  + ` · ${job.fps ? job.fps.toFixed(1) : '-'} fps · ETA ${formatEta(job.eta_seconds)}`}
+            </p>
+          </div>
+        )}
       </div>
 
       {results && (
@@ -64,8 +160,8 @@ function VideoUpload() {
               <p style={styles.statValue}>{results.total_frames}</p>
             </div>
             <div style={styles.statBox}>
-              <p style={styles.statLabel}>Falls Detected</p>
-              <p style={{...styles.statValue, color: '#e74c3c'}}>{results.total_detections}</p>
+              <p style={styles.statLabel}>Fall Events</p>
+              <p style={{...styles.statValue, color: '#e74c3c'}}>{results.total_events ?? results.total_detections}</p>
             </div>
             <div style={styles.statBox}>
               <p style={styles.statLabel}>Detection Rate</p>
@@ -140,6 +236,26 @@ const styles = {
     color: '#7f8c8d',
     margin: 0,
   },
+  optionRow: {
+    display: 'flex',
+    gap: '20px',
+    flexWrap: 'wrap',
+  },
+  optionInput: {
+    padding: '6px 8px',
+    fontSize: '14px',
+    border: '1px solid #e0e0e0',
+    borderRadius: '6px',
+    maxWidth: '220px',
+  },
+  optionLabel: {
+    display: 'flex',
+    alignItems: 'center',
+    gap: '8px',
+    fontSize: '14px',
+    color: '#2c3e50',
+    marginBottom: '20px',
+  },
   uploadButton: {
     width: '100%',
     padding: '16px',
@@ -151,6 +267,26 @@ const styles = {
     borderRadius: '8px',
     transition: 'all 0.3s',
   },
+  progressBox: {
+    marginTop: '20px',
+  },
+  progressTrack: {
+    width: '100%',
+    height: '10px',
+    backgroundColor: '#ecf0f1',
+    borderRadius: '5px',
+    overflow: 'hidden',
+  },
+  progressFill: {
+    height: '100%',
+    backgroundColor: '#3498db',
+    transition: 'width 0.5s',
+  },
+  progressText: {
+    fontSize: '13px',
+    color: '#7f8c8d',
+    margin: '8px 0 0 0',
+  },
   resultsCard: {
     backgroundColor: '#ffffff',
     padding: '40px',
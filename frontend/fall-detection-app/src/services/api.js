@@ -3,15 +3,21 @@ import axios from 'axios';
 const API_BASE_URL = 'http://localhost:8000';
 
 export const api = {
-  detectVideo: async (videoFile) => {
+  detectVideo: async (videoFile, options = {}) => {
     const formData = new FormData();
     formData.append('file', videoFile);
+    Object.entries(options).forEach(([key, value]) => formData.append(key, value));
     const response = await axios.post(`${API_BASE_URL}/detect/video`, formData, {
       headers: { 'Content-Type': 'multipart/form-data' }
     });
     return response.data;
   },
 
+  getJob: async (jobId) => {
+    const response = await axios.get(`${API_BASE_URL}/jobs/${jobId}`);
+    return response.data;
+  },
+
   downloadVideo: (fileId, filename) => {
     return `${API_BASE_URL}/download/${fileId}/${filename}`;
   },
@@ -31,11 +37,58 @@ export const api = {
     return response.data;
   },
 
+  getLiveStreamUrl: () => {
+    return `${API_BASE_URL}/live/stream.mjpg?t=${Date.now()}`;
+  },
+
+  getLiveEventsUrl: () => {
+    return `${API_BASE_URL}/live/events`;
+  },
+
   getStreamUrl: async () => {
     const response = await axios.get(`${API_BASE_URL}/live/stream-url`);
     return response.data;
   },
 
+  // Cameras
+  getCameras: async () => {
+    const response = await axios.get(`${API_BASE_URL}/cameras`);
+    return response.data;
+  },
+
+  addCamera: async (camera) => {
+    const response = await axios.post(`${API_BASE_URL}/cameras`, camera);
+    return response.data;
+  },
+
+  updateCamera: async (cameraId, camera) => {
+    const response = await axios.put(`${API_BASE_URL}/cameras/${cameraId}`, camera);
+    return response.data;
+  },
+
+  deleteCamera: async (cameraId) => {
+    const response = await axios.delete(`${API_BASE_URL}/cameras/${cameraId}`);
+    return response.data;
+  },
+
+  startCamera: async (cameraId) => {
+    const response = await axios.get(`${API_BASE_URL}/live/${cameraId}/start`);
+    return response.data;
+  },
+
+  stopCamera: async (cameraId) => {
+    const response = await axios.get(`${API_BASE_URL}/live/${cameraId}/stop`);
+    return response.data;
+  },
+
+  getCameraStreamUrl: (cameraId) => {
+    return `${API_BASE_URL}/live/${cameraId}/stream.mjpg?t=${Date.now()}`;
+  },
+
+  getCameraEventsUrl: (cameraId) => {
+    return `${API_BASE_URL}/live/${cameraId}/events`;
+  },
+
   // Authentication
   login: async (username, password) => {
     const response = await axios.post(`${API_BASE_URL}/auth/login`, null, {
@@ -108,6 +161,19 @@ export const api = {
   },
 
   // Analytics
+  getDashboard: async (dateFrom, dateTo, recentLimit = 5) => {
+    const response = await axios.get(`${API_BASE_URL}/analytics/dashboard`, {
+      params: { date_from: dateFrom, date_to: dateTo, recent_limit: recentLimit }
+    });
+    return response.data;
+  },
+
+  // Pipeline health: latency percentiles, FPS and queue depths
+  getMetricsSummary: async () => {
+    const response = await axios.get(`${API_BASE_URL}/metrics/summary`);
+    return response.data;
+  },
+
   getAnalyticsSummary: async () => {
     const response = await axios.get(`${API_BASE_URL}/analytics/summary`);
     return response.data;
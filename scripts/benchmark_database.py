@@ -0,0 +1,156 @@
+"""Micro-benchmark for the SQLite access layer in backend/database.py.
+
+Compares the old pattern (a fresh sqlite3.connect per call, rollback
+journal, default synchronous) with the pooled WAL connections now used by
+database.py. Runs against a throwaway database file.
+
+Usage: python scripts/benchmark_database.py [--ops 2000] [--readers 4]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+parser = argparse.ArgumentParser(description="Benchmark database inserts and queries")
+parser.add_argument("--ops", type=int, default=2000, help="operations per phase")
+parser.add_argument("--readers", type=int, default=4, help="reader threads in the mixed phase")
+args = parser.parse_args()
+
+tmp_dir = tempfile.mkdtemp(prefix="fall_db_bench_")
+os.environ["DATABASE_PATH"] = str(Path(tmp_dir) / "bench.db")
+sys.path.insert(0, str(BACKEND_DIR))
+
+import database  # noqa: E402  (needs DATABASE_PATH set first)
+
+database.init_schema()
+
+LEGACY_DB = Path(tmp_dir) / "legacy.db"
+
+
+def legacy_setup():
+    conn = sqlite3.connect(LEGACY_DB)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS detections (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            detection_type TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            camera_source TEXT,
+            image_data TEXT,
+            notes TEXT
+        )
+    ''')
+    conn.commit()
+    conn.close()
+
+
+def legacy_save(confidence):
+    conn = sqlite3.connect(LEGACY_DB)
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO detections (timestamp, detection_type, confidence, camera_source, image_data, notes)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (datetime.now().isoformat(), 'fall', confidence, 'bench', None, None))
+    conn.commit()
+    conn.close()
+
+
+def legacy_query():
+    conn = sqlite3.connect(LEGACY_DB)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT id, timestamp, detection_type, confidence, camera_source, image_data, notes
+        FROM detections
+        ORDER BY timestamp DESC
+        LIMIT 20
+    ''')
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def pooled_save(confidence):
+    database.save_detection('fall', confidence, camera_source='bench')
+
+
+def pooled_query():
+    return database.get_all_detections(limit=20)
+
+
+def insert_rate(save, ops):
+    started = time.perf_counter()
+    for i in range(ops):
+        save(0.5 + (i % 50) / 100)
+    return ops / (time.perf_counter() - started)
+
+
+def query_rate(query, ops):
+    started = time.perf_counter()
+    for _ in range(ops):
+        query()
+    return ops / (time.perf_counter() - started)
+
+
+def mixed(save, query, ops, readers):
+    """One writer and several readers at once, returns (writes/sec, reads/sec)"""
+    reads = [0] * readers
+    done = threading.Event()
+    errors = []
+
+    def reader(slot):
+        try:
+            while not done.is_set():
+                query()
+                reads[slot] += 1
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for i in range(ops):
+        save(0.8)
+    elapsed = time.perf_counter() - started
+    done.set()
+    for t in threads:
+        t.join()
+
+    if errors:
+        print(f"   ⚠️ {len(errors)} reader errors, first: {errors[0]}")
+    return ops / elapsed, sum(reads) / elapsed
+
+
+legacy_setup()
+
+print("=" * 60)
+print("🗄️  DATABASE ACCESS BENCHMARK")
+print("=" * 60)
+print(f"ops per phase: {args.ops}, readers in mixed phase: {args.readers}")
+
+results = {}
+for label, save, query in [
+    ("connect-per-call", legacy_save, legacy_query),
+    ("pooled WAL", pooled_save, pooled_query),
+]:
+    inserts = insert_rate(save, args.ops)
+    queries = query_rate(query, args.ops)
+    mixed_writes, mixed_reads = mixed(save, query, args.ops // 2, args.readers)
+    results[label] = (inserts, queries, mixed_writes, mixed_reads)
+
+print(f"\n{'':18}{'inserts/s':>12}{'queries/s':>12}{'mixed w/s':>12}{'mixed r/s':>12}")
+for label, values in results.items():
+    print(f"{label:18}" + "".join(f"{v:12.0f}" for v in values))
+
+before, after = results["connect-per-call"], results["pooled WAL"]
+print(f"\nspeed-up: inserts x{after[0] / before[0]:.1f}, queries x{after[1] / before[1]:.1f}, "
+      f"mixed writes x{after[2] / before[2]:.1f}, mixed reads x{after[3] / before[3]:.1f}")
+print(f"📂 Scratch databases in: {tmp_dir}")
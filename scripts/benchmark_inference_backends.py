@@ -0,0 +1,109 @@
+"""Benchmark the inference backends on the test videos.
+
+Loads the same weights on each backend through backend/inference_backends.py
+(exporting ONNX / OpenVINO next to the .pt file on first use), runs every
+frame of the test videos resized to the live 640x360 size, and reports FPS
+plus how closely each backend's boxes agree with PyTorch: boxes matched by
+class at IoU >= 0.5, mean IoU of the matches and mean confidence difference.
+
+Usage: python scripts/benchmark_inference_backends.py [--model best.pt]
+       [--backends pytorch,onnx,openvino] [--frames 300] [--conf 0.45]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+from inference_backends import load_model  # noqa: E402
+from video_pipeline import box_iou, open_video, read_frames, result_rows  # noqa: E402
+
+
+def load_frames(video_dir, max_frames):
+    """Up to max_frames frames from each test video, resized like live frames"""
+    frames = []
+    for video_path in sorted(Path(video_dir).glob("*.mp4")):
+        cap, _, _, _ = open_video(video_path)
+        for index, frame in read_frames(cap):
+            if index >= max_frames:
+                break
+            frames.append(cv2.resize(frame, (640, 360)))
+        cap.release()
+    return frames
+
+
+def run_backend(model, frames, conf):
+    """Returns (fps, per-frame rows)"""
+    model.predict(frames[0], conf=conf, verbose=False)
+    outputs = []
+    started = time.perf_counter()
+    for frame in frames:
+        outputs.append(result_rows(model.predict(frame, conf=conf, verbose=False)[0]))
+    return len(frames) / (time.perf_counter() - started), outputs
+
+
+def agreement(reference, outputs, min_iou=0.5):
+    """(recall, precision, mean IoU, mean confidence difference) of outputs against reference boxes"""
+    matched = ref_total = out_total = 0
+    iou_sum = conf_diff_sum = 0.0
+    for ref_rows, out_rows in zip(reference, outputs):
+        ref_total += len(ref_rows)
+        out_total += len(out_rows)
+        unmatched = list(out_rows)
+        for _, ref_cls, ref_conf, *ref_box in ref_rows:
+            best, match = min_iou, None
+            for row in unmatched:
+                if row[1] == ref_cls:
+                    iou = box_iou(ref_box, row[3:])
+                    if iou >= best:
+                        best, match = iou, row
+            if match is not None:
+                unmatched.remove(match)
+                matched += 1
+                iou_sum += best
+                conf_diff_sum += abs(ref_conf - match[2])
+    return (
+        matched / ref_total if ref_total else 1.0,
+        matched / out_total if out_total else 1.0,
+        iou_sum / matched if matched else 0.0,
+        conf_diff_sum / matched if matched else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare inference backends on the test videos")
+    parser.add_argument("--model", default="yolov8n.pt", help=".pt weights to export and compare")
+    parser.add_argument("--backends", default="pytorch,onnx,openvino", help="comma separated, pytorch first")
+    parser.add_argument("--videos", default=str(ROOT / "test_videos"))
+    parser.add_argument("--frames", type=int, default=300, help="frames per video")
+    parser.add_argument("--conf", type=float, default=0.45)
+    args = parser.parse_args()
+
+    frames = load_frames(args.videos, args.frames)
+
+    print("=" * 72)
+    print("⚡ INFERENCE BACKEND BENCHMARK")
+    print("=" * 72)
+    print(f"📹 {len(frames)} frames from {args.videos}, weights {args.model}")
+    print(f"\n{'backend':10}{'load s':>8}{'fps':>8}{'speed-up':>10}{'recall':>9}{'precision':>11}{'IoU':>7}{'Δconf':>8}")
+
+    reference = reference_fps = None
+    for backend in args.backends.split(","):
+        started = time.perf_counter()
+        model, path, used = load_model(args.model, backend)
+        load_seconds = time.perf_counter() - started
+        if used != backend:
+            print(f"{backend:10}  skipped, runtime not available")
+            continue
+
+        fps, outputs = run_backend(model, frames, args.conf)
+        if reference is None:
+            reference, reference_fps = outputs, fps
+        recall, precision, mean_iou, conf_diff = agreement(reference, outputs)
+        print(f"{backend:10}{load_seconds:8.1f}{fps:8.1f}{fps / reference_fps:10.2f}"
+              f"{recall:9.3f}{precision:11.3f}{mean_iou:7.3f}{conf_diff:8.3f}")
+
+    print("\nAgreement is measured against the first backend listed.")
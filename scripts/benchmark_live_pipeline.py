@@ -0,0 +1,232 @@
+"""Benchmark the live detection pipeline end to end on the test videos.
+
+Feeds test_videos/fall_test*.mp4 through LiveDetector.detect_frame as a
+simulated camera and reports per-stage timings (read, resize, pose,
+track, post-process, drawing, JPEG encode, base64) with p50/p95/p99 and
+the resulting FPS. Results are written as JSON so runs can be compared
+across commits and configurations (--compare an earlier result file).
+
+By default frames are decoded as fast as the pipeline consumes them, which
+measures processing throughput. --realtime uses the real CameraStream,
+which plays files at their native fps and drops frames the pipeline can't
+keep up with, like a live camera.
+
+The benchmark runs against a throwaway database, and fall alerts and
+snapshots are switched off.
+
+Usage: python scripts/benchmark_live_pipeline.py [--model best.pt] [--pose-model yolov8n-pose.pt]
+       [--backend pytorch] [--frames 300] [--realtime] [--output result.json] [--compare old.json]
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = ROOT / "backend"
+load_dotenv(BACKEND_DIR / ".env")
+
+# Settings and detections go to a scratch database, never the app's
+os.environ["DATABASE_PATH"] = str(Path(tempfile.mkdtemp(prefix="fall_live_bench_")) / "bench.db")
+sys.path.insert(0, str(BACKEND_DIR))
+
+import database  # noqa: E402
+from live_detection import LiveDetector  # noqa: E402
+from model_registry import model_registry  # noqa: E402
+
+STAGES = ["read", "resize", "pose", "track", "inference", "postprocess", "draw", "encode", "base64"]
+
+
+class VideoFileStream:
+    """Stands in for CameraStream and hands out every frame of a file, unpaced"""
+
+    def __init__(self, path):
+        self.cap = cv2.VideoCapture(str(path))
+
+    def read(self, timeout=None):
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def stop(self):
+        self.cap.release()
+
+
+def percentiles(values):
+    values = np.asarray(values, dtype=float)
+    return {
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_video(detector, video_path, max_frames, realtime, stall_timeout):
+    """Run one video through the detector, returns (per-frame timings, wall seconds, frames dropped)"""
+    if realtime:
+        detector.camera_source = str(video_path)
+        if not detector.connect_camera():
+            sys.exit(f"❌ Cannot open {video_path}")
+    else:
+        detector.stream = VideoFileStream(video_path)
+    # No alerts or snapshots while benchmarking
+    detector.startup_time = datetime.now()
+    detector.startup_cooldown = float("inf")
+
+    frames = []
+    started = last_frame_at = time.perf_counter()
+    while len(frames) < max_frames:
+        frame_jpeg, _, _ = detector.detect_frame()
+        if frame_jpeg is None:
+            if not realtime:
+                break
+            # CameraStream keeps reconnecting to a file it can't decode, so give up eventually
+            if time.perf_counter() - last_frame_at > stall_timeout:
+                detector.stream.stop()
+                sys.exit(f"❌ No frame from {video_path} for {stall_timeout:.0f}s, is the path or codec bad?")
+            continue
+        last_frame_at = time.perf_counter()
+        timings = dict(detector.last_timings)
+        mark = time.perf_counter()
+        base64.b64encode(frame_jpeg).decode("utf-8")
+        timings["base64"] = (time.perf_counter() - mark) * 1000
+        timings["total"] = sum(timings.values())
+        frames.append(timings)
+    elapsed = time.perf_counter() - started
+
+    dropped = detector.stream.frames_dropped if realtime else 0
+    detector.stream.stop()
+    detector.stream = None
+    return frames, elapsed, dropped
+
+
+def summarize(frames, elapsed):
+    stages = {stage: percentiles([f[stage] for f in frames]) for stage in STAGES + ["total"]
+              if any(stage in f for f in frames)}
+    return {"frames": len(frames), "seconds": elapsed, "fps": len(frames) / elapsed if elapsed else 0.0,
+            "stages": stages}
+
+
+def print_summary(summary, previous=None):
+    print(f"\n{'stage':14}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}" + (f"{'Δp50':>9}" if previous else ""))
+    for stage, stats in summary["stages"].items():
+        line = f"{stage:14}" + "".join(f"{stats[key]:9.2f}" for key in ("mean", "p50", "p95", "p99"))
+        if previous and stage in previous["stages"]:
+            line += f"{stats['p50'] - previous['stages'][stage]['p50']:+9.2f}"
+        print(line)
+    fps_line = f"\n⚡ {summary['frames']} frames in {summary['seconds']:.1f}s = {summary['fps']:.1f} FPS"
+    if previous:
+        fps_line += f" (was {previous['fps']:.1f})"
+    print(fps_line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the live detection pipeline on test videos")
+    parser.add_argument("--model", default=os.getenv("MODEL_PATH", "yolov8n.pt"))
+    parser.add_argument("--pose-model", default=os.getenv("POSE_MODEL_PATH", "yolov8n-pose.pt"))
+    parser.add_argument("--backend", default="pytorch", help="inference backend, see backend/inference_backends.py")
+    parser.add_argument("--videos", default=str(ROOT / "test_videos" / "fall_test*.mp4"), help="glob of videos")
+    parser.add_argument("--frames", type=int, default=300, help="frames per video")
+    parser.add_argument("--realtime", action="store_true", help="play videos at native fps through CameraStream")
+    parser.add_argument("--stall-timeout", type=float, default=10.0,
+                        help="with --realtime, seconds without a frame before giving up")
+    parser.add_argument("--batching", action="store_true", help="use the batch inference scheduler")
+    parser.add_argument("--output", default=None, help="result file (default: scripts/results/benchmarks/)")
+    parser.add_argument("--compare", default=None, help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    videos = sorted(Path(args.videos).parent.glob(Path(args.videos).name))
+    if not videos:
+        parser.error(f"no videos match {args.videos}")
+
+    database.init_schema()
+    database.update_setting('inference_batching_enabled', 'true' if args.batching else 'false')
+
+    print("=" * 60)
+    print("🎥 LIVE PIPELINE BENCHMARK")
+    print("=" * 60)
+    model_registry.backend = args.backend
+    model = model_registry.load('fall', args.model)
+    pose_model = model_registry.load('pose', args.pose_model)
+
+    scheduler = None
+    if args.batching:
+        from inference_scheduler import BatchInferenceScheduler
+        scheduler = BatchInferenceScheduler(model, pose_model, batch_size=1)
+        scheduler.start()
+        scheduler.register("bench")
+
+    all_frames = []
+    total_seconds = 0.0
+    per_video = {}
+    for video_path in videos:
+        detector = LiveDetector(model, str(video_path), pose_model, camera_id="bench", scheduler=scheduler)
+        frames, elapsed, dropped = run_video(detector, video_path, args.frames, args.realtime, args.stall_timeout)
+        detector.stop()
+        summary = summarize(frames, elapsed)
+        summary["frames_dropped"] = dropped
+        per_video[video_path.name] = summary
+        all_frames.extend(frames)
+        total_seconds += elapsed
+        print(f"📹 {video_path.name}: {summary['frames']} frames, {summary['fps']:.1f} FPS"
+              + (f", {dropped} dropped" if args.realtime else ""))
+
+    if scheduler is not None:
+        scheduler.stop()
+
+    overall = summarize(all_frames, total_seconds)
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)["overall"]
+    print_summary(overall, previous)
+
+    models = model_registry.get_stats()
+    result = {
+        "timestamp": datetime.now().isoformat(),
+        "commit": git_commit(),
+        "config": {
+            "model": args.model,
+            "pose_model": args.pose_model,
+            "backend": models['fall']['backend'],
+            "pose_backend": models['pose']['backend'],
+            "realtime": args.realtime,
+            "batching": args.batching,
+            "frames_per_video": args.frames,
+            "videos": [video.name for video in videos],
+        },
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "models": models,
+        "overall": overall,
+        "videos": per_video,
+    }
+
+    output = Path(args.output) if args.output else (
+        ROOT / "scripts" / "results" / "benchmarks"
+        / f"live_{datetime.now():%Y%m%d_%H%M%S}_{result['commit'] or 'nocommit'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"📝 Results saved to {output}")
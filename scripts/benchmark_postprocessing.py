@@ -0,0 +1,192 @@
+"""Micro-benchmark the live post-processing of detection and pose results.
+
+Builds synthetic crowded scenes (N people, about half of them fallen, each
+with a 17-keypoint skeleton) as Ultralytics Results and times the
+post-processing in backend/live_detection.py against the per-box,
+per-keypoint loops it replaced, which are kept below as a reference:
+
+  - postprocess: boxes and keypoints to detections plus the
+    skeleton-in-fall-box association
+  - draw: drawing the skeletons on a 640x360 frame
+
+Both versions are checked to return the same detections before timing.
+
+Usage: python scripts/benchmark_postprocessing.py [--people 1,5,20,50] [--repeats 200] [--device cpu]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+from live_detection import SKELETON_CONNECTIONS, LiveDetector, fall_class_mask, postprocess  # noqa: E402
+
+NAMES = {0: "Fall-Detected", 1: "Person"}
+FALL_CONFIDENCE = 0.5
+
+
+# ==================== PREVIOUS IMPLEMENTATION ====================
+
+def legacy_is_skeleton_inside_bbox(kp_array, bbox, threshold=0.5):
+    x1, y1, x2, y2 = bbox
+    total = 0
+    inside = 0
+    for x, y in kp_array:
+        if x > 0 and y > 0:
+            total += 1
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                inside += 1
+    if total == 0:
+        return False
+    return (inside / total) >= threshold
+
+
+def legacy_postprocess(results, pose_results, names, fall_confidence):
+    """detect_frame before vectorization, without drawing"""
+    pose_keypoints = []
+    for pose_r in pose_results:
+        if pose_r is not None and pose_r.keypoints is not None:
+            for keypoints in pose_r.keypoints:
+                pose_keypoints.append(keypoints)
+
+    fall_bboxes = []
+    all_boxes = []
+    for r in results:
+        for box in r.boxes:
+            x1, y1, x2, y2 = box.xyxy[0].tolist()
+            conf = float(box.conf[0])
+            cls = int(box.cls[0])
+            class_name = names[cls]
+            track_id = int(box.id[0]) if box.id is not None else None
+            is_fall = 'fall' in class_name.lower()
+            all_boxes.append({'bbox': [x1, y1, x2, y2], 'conf': conf, 'class_name': class_name,
+                              'track_id': track_id, 'is_fall': is_fall and conf >= fall_confidence})
+            if is_fall and conf >= fall_confidence:
+                fall_bboxes.append([x1, y1, x2, y2])
+
+    fall_keypoints = {}
+    skeletons = []
+    for keypoints in pose_keypoints:
+        kp_array = keypoints.xy[0].cpu().numpy()
+        is_fall_skeleton = False
+        for fall_idx, fall_bbox in enumerate(fall_bboxes):
+            if legacy_is_skeleton_inside_bbox(kp_array, fall_bbox, threshold=0.3):
+                is_fall_skeleton = True
+                if fall_idx not in fall_keypoints:
+                    fall_keypoints[fall_idx] = [[round(float(x), 1), round(float(y), 1)] for x, y in kp_array]
+                break
+        skeletons.append((keypoints, is_fall_skeleton))
+
+    detections = []
+    for box_data in all_boxes:
+        if box_data['is_fall']:
+            detections.append({'bbox': box_data['bbox'], 'confidence': box_data['conf'],
+                               'class': box_data['class_name'], 'track_id': box_data['track_id'],
+                               'keypoints': fall_keypoints.get(len(detections))})
+    return detections, skeletons
+
+
+def legacy_draw_pose(frame, keypoints, color=(0, 255, 255)):
+    kp_array = keypoints.xy[0].cpu().numpy()
+    kp_conf = keypoints.conf[0].cpu().numpy() if keypoints.conf is not None else None
+    for i, (x, y) in enumerate(kp_array):
+        if i < 5:
+            continue
+        if kp_conf is not None and kp_conf[i] < 0.3:
+            continue
+        if x > 0 and y > 0:
+            cv2.circle(frame, (int(x), int(y)), 4, color, -1)
+    for start_idx, end_idx in SKELETON_CONNECTIONS:
+        x1, y1 = kp_array[start_idx]
+        x2, y2 = kp_array[end_idx]
+        if kp_conf is not None and (kp_conf[start_idx] < 0.3 or kp_conf[end_idx] < 0.3):
+            continue
+        if x1 > 0 and y1 > 0 and x2 > 0 and y2 > 0:
+            cv2.line(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 2)
+    return frame
+
+
+# ==================== SCENES ====================
+
+def make_scene(people, device, seed=0):
+    """(fall results, pose results) for a 640x360 frame with `people` tracked people"""
+    rng = np.random.default_rng(seed)
+    frame = np.zeros((360, 640, 3), np.uint8)
+    boxes, skeletons = [], []
+    for track_id in range(1, people + 1):
+        w, h = rng.uniform(40, 120), rng.uniform(60, 200)
+        x1, y1 = rng.uniform(0, 640 - w), rng.uniform(0, 360 - h)
+        fallen = rng.random() < 0.5
+        boxes.append([x1, y1, x1 + w, y1 + h, track_id, rng.uniform(0.3, 0.95), 0 if fallen else 1])
+
+        # Keypoints mostly inside the box, some outside or undetected (0, 0)
+        xy = np.column_stack([rng.uniform(x1 - 0.2 * w, x1 + 1.2 * w, 17), rng.uniform(y1 - 0.2 * h, y1 + 1.2 * h, 17)])
+        conf = rng.uniform(0, 1, 17)
+        xy[conf < 0.2] = 0
+        skeletons.append(np.column_stack([xy, conf]))
+
+    boxes = torch.tensor(boxes, dtype=torch.float32, device=device).reshape(-1, 7)
+    keypoints = torch.tensor(np.array(skeletons), dtype=torch.float32, device=device).reshape(-1, 17, 3)
+    pose_boxes = torch.zeros((len(keypoints), 6), dtype=torch.float32, device=device)
+    results = [Results(frame, path="", names=NAMES, boxes=boxes)]
+    pose_results = [Results(frame, path="", names={0: "person"}, boxes=pose_boxes, keypoints=keypoints)]
+    return results, pose_results
+
+
+def time_ms(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def speedup(old, new):
+    return old / new if new else 1.0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vectorized post-processing against the per-box loops")
+    parser.add_argument("--people", default="1,5,20,50", help="comma separated crowd sizes")
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--device", default="cpu", help="device the result tensors live on, e.g. cuda:0")
+    args = parser.parse_args()
+
+    fall_classes = fall_class_mask(NAMES)
+    draw_pose = LiveDetector.draw_pose
+
+    print("=" * 72)
+    print("🧮 POST-PROCESSING MICRO-BENCHMARK")
+    print("=" * 72)
+    print(f"Median of {args.repeats} runs, result tensors on {args.device}\n")
+    print(f"{'people':>7}{'falls':>7}{'postprocess ms':>24}{'speed-up':>10}{'draw ms':>20}{'speed-up':>10}")
+    print(f"{'':14}{'loops':>12}{'arrays':>12}{'':10}{'loops':>10}{'arrays':>10}")
+
+    for people in (int(n) for n in args.people.split(",")):
+        results, pose_results = make_scene(people, args.device)
+
+        expected, legacy_skeletons = legacy_postprocess(results, pose_results, NAMES, FALL_CONFIDENCE)
+        detections, skeletons = postprocess(results, pose_results, NAMES, fall_classes, FALL_CONFIDENCE)
+        if detections != expected or [s[2] for s in skeletons] != [s[1] for s in legacy_skeletons]:
+            sys.exit(f"❌ Vectorized post-processing differs from the loops with {people} people")
+
+        frame = np.zeros((360, 640, 3), np.uint8)
+        old_post = time_ms(lambda: legacy_postprocess(results, pose_results, NAMES, FALL_CONFIDENCE), args.repeats)
+        new_post = time_ms(lambda: postprocess(results, pose_results, NAMES, fall_classes, FALL_CONFIDENCE),
+                           args.repeats)
+        old_draw = time_ms(lambda: [legacy_draw_pose(frame, keypoints) for keypoints, _ in legacy_skeletons],
+                           args.repeats)
+        new_draw = time_ms(lambda: [draw_pose(None, frame, xy, conf) for xy, conf, _ in skeletons], args.repeats)
+
+        print(f"{people:7}{len(detections):7}{old_post:12.3f}{new_post:12.3f}{speedup(old_post, new_post):9.1f}x"
+              f"{old_draw:10.3f}{new_draw:10.3f}{speedup(old_draw, new_draw):9.1f}x")
+
+    print("\n✅ Both versions returned the same detections and skeleton matches")
@@ -0,0 +1,84 @@
+"""Benchmark serial vs parallel segment processing of a long video.
+
+Builds a long test video by looping a clip, then times the serial streaming
+pipeline against backend/video_segments.py with different worker counts.
+Both paths track every frame and write the annotated output video.
+
+Usage: python scripts/benchmark_video_segments.py [--video test_videos/fall_test1.mp4]
+       [--loops 20] [--workers 1,2,4] [--model yolov8n.pt]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+from ultralytics import YOLO
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+from video_pipeline import open_video, open_writer, read_frames, stream_video  # noqa: E402
+from video_segments import render_video, track_video_segments  # noqa: E402
+
+
+def build_long_video(clip_path, output_path, loops):
+    """Loop a clip into one long video, returns the frame count"""
+    cap, fps, size, _ = open_video(clip_path)
+    writer = open_writer(output_path, fps, size)
+    frames = 0
+    for _ in range(loops):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        for _, frame in read_frames(cap):
+            writer.write(frame)
+            frames += 1
+    cap.release()
+    writer.release()
+    return frames
+
+
+def run_serial(model_path, video_path, output_path, conf):
+    model = YOLO(model_path)
+    started = time.perf_counter()
+    frames = sum(1 for _ in stream_video(model, video_path, output_path, conf=conf, track=True))
+    return frames, time.perf_counter() - started
+
+
+def run_parallel(model_path, video_path, output_path, total, conf, workers):
+    started = time.perf_counter()
+    rows = track_video_segments(model_path, video_path, total, conf, workers)
+    render_video(video_path, output_path, rows, YOLO(model_path).names)
+    return total, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parallel segment video processing")
+    parser.add_argument("--video", default=str(ROOT / "test_videos" / "fall_test1.mp4"))
+    parser.add_argument("--loops", type=int, default=20, help="times the clip is repeated")
+    parser.add_argument("--workers", default="1,2,4", help="comma separated worker counts")
+    parser.add_argument("--model", default="yolov8n.pt")
+    parser.add_argument("--conf", type=float, default=0.5)
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="fall_segments_bench_"))
+    long_video = tmp_dir / "long.avi"
+
+    print("=" * 60)
+    print("🎬 PARALLEL VIDEO SEGMENT BENCHMARK")
+    print("=" * 60)
+    total = build_long_video(args.video, long_video, args.loops)
+    print(f"📹 {total} frames, {os.cpu_count()} CPU cores")
+
+    frames, elapsed = run_serial(args.model, long_video, tmp_dir / "serial.avi", args.conf)
+    serial_fps = frames / elapsed
+    print(f"\n{'mode':14}{'seconds':>10}{'fps':>10}{'speed-up':>10}")
+    print(f"{'serial':14}{elapsed:10.1f}{serial_fps:10.1f}{1.0:10.2f}")
+
+    for workers in [int(w) for w in args.workers.split(",")]:
+        frames, elapsed = run_parallel(args.model, long_video, tmp_dir / f"parallel_{workers}.avi",
+                                       total, args.conf, workers)
+        fps = frames / elapsed
+        print(f"{f'{workers} workers':14}{elapsed:10.1f}{fps:10.1f}{fps / serial_fps:10.2f}")
+
+    print(f"\n📂 Scratch files in: {tmp_dir}")
@@ -0,0 +1,68 @@
+"""Check that importing the API stays fast.
+
+Imports backend/app.py in a fresh interpreter, without running the startup
+hook, and fails if it takes longer than the limit or pulls in torch or
+ultralytics, or if the import touched the database.
+
+The exit code is the result, so CI can run it as a test: 0 on pass, 1 on
+a regression, 2 if app.py couldn't be imported at all.
+
+Usage: python scripts/check_startup_time.py [--max-seconds 1.0] [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import app
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "heavy_modules": [name for name in ("torch", "ultralytics") if name in sys.modules],
+}))
+"""
+
+parser = argparse.ArgumentParser(description="Check the API imports quickly and lazily")
+parser.add_argument("--max-seconds", type=float, default=1.0, help="allowed import time")
+parser.add_argument("--runs", type=int, default=3, help="imports to time, the fastest one counts")
+args = parser.parse_args()
+
+PASS, REGRESSION, ERROR = 0, 1, 2
+
+db_path = Path(tempfile.mkdtemp(prefix="fall_startup_check_")) / "startup.db"
+env = dict(os.environ, DATABASE_PATH=str(db_path))
+
+runs = []
+for _ in range(args.runs):
+    probe = subprocess.run([sys.executable, "-c", PROBE, str(BACKEND_DIR)], env=env, cwd=BACKEND_DIR,
+                           capture_output=True, text=True)
+    if probe.returncode != 0:
+        print(probe.stderr)
+        print("❌ ERROR: importing app failed")
+        sys.exit(ERROR)
+    runs.append(json.loads(probe.stdout.strip().splitlines()[-1]))
+
+best = min(run["seconds"] for run in runs)
+heavy = sorted({name for run in runs for name in run["heavy_modules"]})
+print(f"⏱️ import app: best {best:.3f}s over {len(runs)} runs (limit {args.max_seconds:.1f}s)")
+
+failures = []
+if best > args.max_seconds:
+    failures.append(f"import took {best:.3f}s")
+if heavy:
+    failures.append(f"imported {', '.join(heavy)}")
+if db_path.exists():
+    failures.append("touched the database")
+
+if failures:
+    print(f"❌ FAIL: {'; '.join(failures)}")
+    sys.exit(REGRESSION)
+print("✅ PASS")
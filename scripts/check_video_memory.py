@@ -0,0 +1,122 @@
+"""Check that video analysis runs in constant memory.
+
+Writes a long synthetic video, runs it through the streaming pipeline in
+backend/video_pipeline.py and samples resident memory as it goes.
+
+The exit code is the result, so CI can run it as a regression test:
+0 if memory stayed bounded, 1 if RSS kept growing after warm-up (which is
+what happens when per-frame results are accumulated), 2 if the check
+couldn't run (bad arguments, model or video errors).
+
+Usage: python scripts/check_video_memory.py [--frames 3000] [--model yolov8n.pt] [--max-growth-mb 64] [--keep]
+"""
+import argparse
+import resource
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from video_pipeline import stream_video  # noqa: E402
+
+parser = argparse.ArgumentParser(description="Check video analysis memory stays bounded")
+parser.add_argument("--frames", type=int, default=3000, help="length of the synthetic video")
+parser.add_argument("--width", type=int, default=1280)
+parser.add_argument("--height", type=int, default=720)
+parser.add_argument("--model", default="yolov8n.pt", help="weights or model yaml to run")
+parser.add_argument("--warmup", type=int, default=200, help="frames before the baseline is taken")
+parser.add_argument("--max-growth-mb", type=float, default=64, help="allowed RSS growth after warm-up")
+parser.add_argument("--keep", action="store_true", help="keep the synthetic and annotated videos")
+args = parser.parse_args()
+
+PASS, REGRESSION, ERROR = 0, 1, 2
+
+
+def rss_mb():
+    """Current resident set size, falls back to peak RSS where /proc isn't available"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def write_synthetic_video(path, frames, width, height):
+    """A box moving across a noisy background, so every frame differs"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    for i in range(frames):
+        frame = background.copy()
+        x = (i * 7) % (width - 200)
+        cv2.rectangle(frame, (x, height // 3), (x + 200, height // 3 + 300), (40, 120, 220), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def measure(tmp_dir):
+    """Run the pipeline over a synthetic video, returns (baseline, peak, samples) in MB"""
+    video_path = tmp_dir / "synthetic.avi"
+    print(f"🎥 Writing {args.frames} frames at {args.width}x{args.height}...")
+    write_synthetic_video(video_path, args.frames, args.width, args.height)
+
+    model = YOLO(args.model)
+    baseline = None
+    peak = 0
+    samples = []
+
+    for index, result in stream_video(model, video_path, tmp_dir / "annotated.avi", conf=0.25):
+        if index == args.warmup:
+            baseline = rss_mb()
+        if baseline is not None and index % 100 == 0:
+            current = rss_mb()
+            peak = max(peak, current)
+            samples.append((index, current))
+    return baseline, peak, samples
+
+
+def main():
+    print("=" * 60)
+    print("🧪 VIDEO MEMORY CHECK")
+    print("=" * 60)
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="fall_video_mem_"))
+    try:
+        baseline, peak, samples = measure(tmp_dir)
+    except Exception as e:
+        print(f"❌ ERROR: could not run the check: {e}")
+        return ERROR
+    finally:
+        if args.keep:
+            print(f"📂 Scratch files in: {tmp_dir}")
+        else:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if baseline is None:
+        print(f"❌ ERROR: video shorter than the warm-up ({args.warmup} frames)")
+        return ERROR
+
+    for index, current in samples:
+        print(f"   frame {index:6d}: {current:8.1f} MB")
+
+    growth = peak - baseline
+    print(f"\nbaseline {baseline:.1f} MB, peak {peak:.1f} MB, growth {growth:.1f} MB")
+
+    if growth > args.max_growth_mb:
+        print(f"❌ FAIL: RSS grew by more than {args.max_growth_mb:.0f} MB")
+        return REGRESSION
+    print("✅ PASS: memory stayed bounded")
+    return PASS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Quantize the fall model to INT8 and validate it against the FP32 model.
+
+Calibrates an INT8 export (OpenVINO with NNCF, or ONNX Runtime static
+quantization) of the fall weights on images from dataset/train, then
+evaluates FP32 and INT8 on dataset/valid and dataset/test:
+
+  - mAP50 and mAP50-95 from Ultralytics validation
+  - precision / recall / F1 at the app's confidence_threshold (IoU >= 0.5)
+  - latency per image at batch size 1
+
+The INT8 model is written next to the .pt file, where the 'onnx-int8' and
+'openvino-int8' inference_backend settings look for it. If it loses more
+than --max-map-drop mAP50 on the validation split the export is deleted
+again (unless --keep-failed) and the script exits with code 1.
+
+Usage: python scripts/quantize_fall_model.py [--model backend/best.pt]
+       [--format openvino|onnx] [--calibration-images 300] [--max-images 0]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import yaml
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = ROOT / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+from inference_backends import artifact_path, backend_available, export_model  # noqa: E402
+from video_pipeline import box_iou, result_rows  # noqa: E402
+
+load_dotenv(BACKEND_DIR / ".env")
+
+
+def resolved_data_yaml(data_yaml):
+    """Copy of data.yaml with absolute split paths (Roboflow writes them relative to a parent folder)"""
+    data_yaml = Path(data_yaml).resolve()
+    with open(data_yaml) as f:
+        data = yaml.safe_load(f)
+
+    dataset_dir = data_yaml.parent
+    resolved = {"path": str(dataset_dir), "nc": data["nc"], "names": data["names"]}
+    for key, folder in (("train", "train"), ("val", "valid"), ("test", "test")):
+        resolved[key] = str(dataset_dir / folder / "images")
+
+    path = Path(tempfile.mkdtemp(prefix="fall_quantize_")) / "data.yaml"
+    with open(path, "w") as f:
+        yaml.safe_dump(resolved, f)
+    return path, resolved
+
+
+def default_confidence():
+    """confidence_threshold from the app's database, or its default"""
+    import database
+
+    if not database.DB_PATH.exists():
+        return 0.75
+    return float(database.get_setting('confidence_threshold', 0.75))
+
+
+def read_labels(label_path, width, height):
+    """YOLO label file to (class_id, x1, y1, x2, y2) pixel boxes"""
+    boxes = []
+    if label_path.exists():
+        for line in label_path.read_text().splitlines():
+            if not line.strip():
+                continue
+            class_id, cx, cy, w, h = (float(v) for v in line.split()[:5])
+            boxes.append((int(class_id), (cx - w / 2) * width, (cy - h / 2) * height,
+                          (cx + w / 2) * width, (cy + h / 2) * height))
+    return boxes
+
+
+def evaluate(model, data_yaml, split, images_dir, conf, max_images):
+    """mAP, precision/recall at conf and latency of one model on one split"""
+    metrics = model.val(data=str(data_yaml), split=split, imgsz=640, batch=1, plots=False, verbose=False)
+
+    images = sorted(p for p in Path(images_dir).iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+    if max_images:
+        images = images[:max_images]
+    labels_dir = Path(images_dir).parent / "labels"
+
+    true_pos = false_pos = false_neg = 0
+    latencies = []
+    for image_path in images:
+        image = cv2.imread(str(image_path))
+        started = time.perf_counter()
+        result = model.predict(image, conf=conf, verbose=False)[0]
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        truth = read_labels(labels_dir / f"{image_path.stem}.txt", image.shape[1], image.shape[0])
+        predictions = sorted(result_rows(result), key=lambda row: -row[2])
+        for _, class_id, _, *box in predictions:
+            best, match = 0.5, None
+            for gt in truth:
+                if gt[0] == class_id:
+                    iou = box_iou(box, gt[1:])
+                    if iou >= best:
+                        best, match = iou, gt
+            if match is None:
+                false_pos += 1
+            else:
+                truth.remove(match)
+                true_pos += 1
+        false_neg += len(truth)
+
+    precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else 0.0
+    recall = true_pos / (true_pos + false_neg) if true_pos + false_neg else 0.0
+    return {
+        "images": len(images),
+        "map50": float(metrics.box.map50),
+        "map50_95": float(metrics.box.map),
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "latency_ms": float(np.mean(latencies)) if latencies else 0.0,
+        "latency_p95_ms": float(np.percentile(latencies, 95)) if latencies else 0.0,
+    }
+
+
+def print_comparison(split, fp32, int8):
+    print(f"\n📊 {split}: mAP on the whole split, precision/recall and latency on {fp32['images']} images")
+    print(f"   {'metric':16}{'FP32':>10}{'INT8':>10}{'change':>10}")
+    for key in ("map50", "map50_95", "precision", "recall", "f1"):
+        print(f"   {key:16}{fp32[key]:10.3f}{int8[key]:10.3f}{int8[key] - fp32[key]:+10.3f}")
+    for key in ("latency_ms", "latency_p95_ms"):
+        speedup = fp32[key] / int8[key] if int8[key] else 0.0
+        print(f"   {key:16}{fp32[key]:10.1f}{int8[key]:10.1f}{speedup:9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize the fall model to INT8 and validate it")
+    parser.add_argument("--model", default=os.getenv("MODEL_PATH"), help="fall .pt weights (default: MODEL_PATH)")
+    parser.add_argument("--format", choices=("openvino", "onnx"), default="openvino")
+    parser.add_argument("--data", default=str(ROOT / "dataset" / "data.yaml"))
+    parser.add_argument("--calibration-images", type=int, default=300, help="train images used for calibration")
+    parser.add_argument("--conf", type=float, default=None, help="default: the app's confidence_threshold")
+    parser.add_argument("--max-images", type=int, default=0, help="limit images per split for P/R and latency, 0 = all")
+    parser.add_argument("--max-map-drop", type=float, default=0.02, help="allowed mAP50 loss on the validation split")
+    parser.add_argument("--keep-failed", action="store_true", help="keep the INT8 model even if it fails validation")
+    args = parser.parse_args()
+
+    if not args.model or Path(args.model).suffix != ".pt":
+        parser.error("--model must point to the fall model's .pt weights")
+    backend = f"{args.format}-int8"
+    if not backend_available(backend):
+        parser.error(f"the {args.format} runtime is not installed")
+
+    from ultralytics import YOLO
+
+    conf = args.conf if args.conf is not None else default_confidence()
+    data_yaml, data = resolved_data_yaml(args.data)
+    train_images = len(list(Path(data["train"]).iterdir()))
+
+    print("=" * 60)
+    print("🧮 INT8 QUANTIZATION")
+    print("=" * 60)
+    print(f"📦 {args.model} -> {backend}, calibrating on {min(args.calibration_images, train_images)} train images")
+    started = time.perf_counter()
+    int8_path = export_model(args.model, backend, force=True, data=str(data_yaml), split="train",
+                             fraction=min(1.0, args.calibration_images / train_images))
+    print(f"✅ INT8 model written to {int8_path} in {time.perf_counter() - started:.0f}s")
+
+    fp32_model = YOLO(args.model)
+    int8_model = YOLO(str(int8_path))
+    print(f"🎯 Precision/recall at confidence {conf:.2f}")
+
+    report = {"model": str(args.model), "int8_model": str(int8_path), "backend": backend,
+              "confidence": conf, "splits": {}}
+    for split, folder in (("val", data["val"]), ("test", data["test"])):
+        fp32 = evaluate(fp32_model, data_yaml, split, folder, conf, args.max_images)
+        int8 = evaluate(int8_model, data_yaml, split, folder, conf, args.max_images)
+        report["splits"][split] = {"fp32": fp32, "int8": int8}
+        print_comparison(split, fp32, int8)
+
+    map_drop = report["splits"]["val"]["fp32"]["map50"] - report["splits"]["val"]["int8"]["map50"]
+    report["passed"] = map_drop <= args.max_map_drop
+
+    report_path = Path(args.model).with_name(f"{Path(args.model).stem}_int8_report.json")
+    report_path.write_text(json.dumps(report, indent=2))
+    print(f"\n📝 Report saved to {report_path}")
+
+    if not report["passed"]:
+        print(f"❌ INT8 model loses {map_drop:.3f} mAP50 on the validation split (limit {args.max_map_drop:.3f})")
+        if not args.keep_failed:
+            target = artifact_path(args.model, backend)
+            shutil.rmtree(target) if target.is_dir() else target.unlink(missing_ok=True)
+            print(f"🗑️ Removed {target} so the {backend} setting keeps using FP32")
+        sys.exit(1)
+
+    print(f"✅ PASS: mAP50 change {-map_drop:+.3f}. Set inference_backend to '{backend}' to use it.")
@@ -1,19 +1,38 @@
 from ultralytics import YOLO
+from dotenv import load_dotenv
 from pathlib import Path
-import cv2
+import argparse
+import os
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+load_dotenv(ROOT / "backend" / ".env")
+from video_pipeline import SAMPLING_MODES, build_sampler, open_video, stream_video, stream_video_sampled  # noqa: E402
+
+parser = argparse.ArgumentParser(description="Run fall detection on the test videos")
+parser.add_argument("--sampling", choices=SAMPLING_MODES, default="all",
+                    help="frames to analyse: all, every Nth (stride), target fps, or dense around candidate falls")
+parser.add_argument("--stride", type=int, default=5, help="analyse every Nth frame (stride and dense modes)")
+parser.add_argument("--target-fps", type=float, default=5, help="analysis rate for the fps mode")
+parser.add_argument("--model", default=os.getenv("MODEL_PATH", str(ROOT / "models" / "best.pt")),
+                    help="weights to test (default: MODEL_PATH)")
+parser.add_argument("--videos", default=str(ROOT / "test_videos"), help="folder of test videos")
+parser.add_argument("--output", default=str(ROOT / "scripts" / "results"), help="folder for annotated videos")
+args = parser.parse_args()
 
 print("="*60)
 print("🚀 FALL DETECTION VIDEO TESTING")
 print("="*60)
 
 # Load your trained model
-model_path = r"C:\FallDetection\models\best.pt"
+model_path = args.model
 print(f"\n📦 Loading model from: {model_path}")
 model = YOLO(model_path)
 print("✅ Model loaded successfully!")
 
 # Get video files
-video_folder = Path(r"C:\FallDetection\test_videos")
+video_folder = Path(args.videos)
 video_files = list(video_folder.glob("*.mp4")) + list(video_folder.glob("*.avi"))
 
 if not video_files:
@@ -27,25 +46,27 @@ print("="*60)
 for i, video_path in enumerate(video_files, 1):
     print(f"\n📹 Processing video {i}/{len(video_files)}: {video_path.name}")
     
-    # Run detection on video
-    results = model(
-        source=str(video_path),
-        conf=0.5,  # 50% confidence threshold
-        save=True,  # Save output video
-        project=r"C:\FallDetection\scripts\results",
-        name=f"video_{i}",
-        exist_ok=True
-    )
-    
-    # Count detections
+    output_dir = Path(args.output) / f"video_{i}"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    output_path = output_dir / f"{video_path.stem}.avi"
+    cap, fps, _, _ = open_video(video_path)
+    cap.release()
+    should_analyse = build_sampler(model, video_path, args.sampling, fps, args.stride, args.target_fps, conf=0.5)
+
+    # Run detection frame by frame, writing the annotated output as it goes
     total_detections = 0
-    for r in results:
-        total_detections += len(r.boxes)
-    
+    if should_analyse is None:
+        for _, r in stream_video(model, video_path, output_path, conf=0.5):
+            total_detections += len(r.boxes)
+    else:
+        for _, rows in stream_video_sampled(model, video_path, output_path, should_analyse, conf=0.5):
+            total_detections += len(rows)
+
     print(f"   ✅ Complete! Total fall detections: {total_detections}")
-    print(f"   💾 Output saved to: C:\\FallDetection\\scripts\\results\\video_{i}")
+    print(f"   💾 Output saved to: {output_dir}")
 
 print("\n" + "="*60)
 print("✅ ALL VIDEOS PROCESSED!")
-print(f"📂 Check output videos in: C:\\FallDetection\\scripts\\results\\")
+print(f"📂 Check output videos in: {args.output}")
 print("="*60)
\ No newline at end of file